@@ -1,22 +1,44 @@
-#Merge both marksheet csv files which are gernerated by OCR
+#Merge marksheet csv files which are gernerated by OCR
 
 import pandas as pd
-m1 = pd.read_csv('/content/marksheet_marks (5).csv')
-m2 = pd.read_csv('/content/marksheet_marks (7).csv')
 
-# Assign a unique student ID to each marksheet before merging
-m1['id'] = 1 # Assuming this marksheet is for student_id 1
-m2['id'] = 2 # Assuming this marksheet is for student_id 2
+import storage
 
-# Concatenate the dataframes. Now both have an 'id' column.
-merged = pd.concat([m1, m2], axis=0, ignore_index=True)
-merged.to_csv('marksheet_merged.csv', index=False)
+def merge_marksheets(marksheets, root=None, output_csv=None):
+    """
+    marksheets: {student_id: OCR csv path}
+    Appends the marksheets as one new segment of the storage.py marks store
+    (nothing already merged is re-read or rewritten); duplicates are resolved
+    with the max rule on read and by storage.compact().
+    output_csv: optionally also export the full merged table as CSV.
+    """
+    root = root or storage.MARKS_ROOT
+
+    frames = [storage.marks_frame(pd.read_csv(csv_path), student_id)
+              for student_id, csv_path in marksheets.items()]
+    if frames:
+        storage.append_marks(pd.concat(frames, ignore_index=True), root=root)
+
+    if output_csv:
+        merged = storage.read_marks_merged(root=root)
+        merged.rename(columns={"student_id": "id", "subject": "Subject",
+                               "max": "Maximum", "obtained": "Obtained"}).to_csv(output_csv, index=False)
+    return root
+
+if __name__ == "__main__":
+    merge_marksheets({
+        1: '/content/marksheet_marks (5).csv',
+        2: '/content/marksheet_marks (7).csv',
+    })
 
 
 
 #LLM Model
 
 
+import re
+
+import numpy as np
 import pandas as pd
 
 # ----------------------------------------------
@@ -70,8 +92,13 @@ SUBFIELDS = {
 # ----------------------------------------------
 # LOAD PERSONALITY TEST (RIASEC + TCI)
 # ----------------------------------------------
-def load_personality(csv_path):
-    df = pd.read_csv(csv_path)
+def load_personality(csv_path, columns=None):
+    # csv_path may also be a storage.py results dataset (directory / .parquet);
+    # columns limits what is read to the ones the caller needs
+    if storage.is_columnar(csv_path):
+        df = storage.read_results(columns=columns, root=csv_path)
+    else:
+        df = pd.read_csv(csv_path, usecols=(lambda c: c in columns) if columns else None)
     df = df.rename(columns={"user_id": "student_id"})
     return df
 
@@ -80,9 +107,13 @@ def load_personality(csv_path):
 # LOAD MARKSHEET & CONVERT TO WIDE FORMAT
 # ----------------------------------------------
 def load_marksheet(csv_path):
-    df = pd.read_csv(csv_path)
+    return prepare_marksheet(pd.read_csv(csv_path))
+
+
+def prepare_marksheet(df):
+    # Works on an OCR frame (Subject / Maximum / Obtained) already in memory
     df = df.rename(columns={"Obtained": "marks", "Subject": "subject"})
-    df = df[["subject", "marks"]]    # Only two columns needed
+    df = df[["subject", "marks"]].copy()    # Only two columns needed
     df = df[~df["subject"].str.contains("TOTAL", case=False)]  # remove TOTAL rows
     df["subject"] = df["subject"].str.upper().str.strip()
     df = df.groupby("subject")["marks"].max().reset_index()   # handle duplicates
@@ -92,78 +123,238 @@ def load_marksheet(csv_path):
 # ----------------------------------------------
 # EXTRACT SUBJECT SCORES (MATH / PHY / ENG etc.)
 # ----------------------------------------------
+SUBJECT_KEYWORDS = {
+    "math": ["MATH", "MATHEMATICS"],
+    "physics": ["PHYSICS"],
+    "chemistry": ["CHEMISTRY"],
+    "biology": ["BIOLOGY"],
+    "computer": ["COMPUTER"],
+    "english": ["ENGLISH"],
+    "urdu": ["URDU"],
+    "islamiat": ["ISLAM", "ISLAMIYAT"],
+    "pakstudies": ["PAKISTAN"]
+}
+
+
+SUBJECT_KEYS = list(SUBJECT_KEYWORDS)
+
+# -------------------------
+# SUBJECT NAME INDEX (compiled once)
+# A subject name belongs to a key if it contains one of the key's keywords
+# (case-insensitive); an earlier keyword in the list outranks a later one.
+# -------------------------
+_KEYWORD_RANKS = {}    # keyword -> [(key column, rank), ...]
+for _col, _key in enumerate(SUBJECT_KEYS):
+    for _rank, _kw in enumerate(SUBJECT_KEYWORDS[_key]):
+        _KEYWORD_RANKS.setdefault(_kw.upper(), []).append((_col, _rank))
+
+# One pass over a name finds every keyword: the lookahead makes finditer try
+# every position, and longest-first alternation picks the longest keyword
+# there. Shorter keywords inside a hit ("MATH" in "MATHEMATICS") are implied.
+_SUBJECT_RE = re.compile("(?=(" + "|".join(re.escape(kw) for kw in sorted(_KEYWORD_RANKS, key=len, reverse=True)) + "))")
+_IMPLIED_KEYWORDS = {kw: [other for other in _KEYWORD_RANKS if other in kw] for kw in _KEYWORD_RANKS}
+
+def _match_name(name):
+    ranks = {}
+    for hit in {m.group(1) for m in _SUBJECT_RE.finditer(name.upper())}:
+        for kw in _IMPLIED_KEYWORDS[hit]:
+            for col, rank in _KEYWORD_RANKS[kw]:
+                ranks[col] = min(ranks.get(col, rank), rank)
+    return ranks
+
+# Exact subject name -> {key column: rank}; seeded with the keywords
+# themselves, then filled with every new name seen.
+_SUBJECT_INDEX = {kw: _match_name(kw) for kw in _KEYWORD_RANKS}
+_SUBJECT_INDEX_MAX = 100_000
+
+def match_subject(name):
+    ranks = _SUBJECT_INDEX.get(name)
+    if ranks is None:
+        ranks = _match_name(name)
+        if len(_SUBJECT_INDEX) < _SUBJECT_INDEX_MAX:   # OCR junk must not grow this forever
+            _SUBJECT_INDEX[name] = ranks
+    return ranks
+
+
+def map_subjects(subjects):
+    """
+    Map a whole column of subject names in one pass.
+    Returns an (len(subjects), len(SUBJECT_KEYS)) float array of keyword
+    ranks, NaN where the name doesn't belong to that subject key.
+    Each distinct name is matched once, however many students share it.
+    """
+    codes, uniques = pd.factorize(pd.Series(subjects), use_na_sentinel=True)
+    table = np.full((len(uniques) + 1, len(SUBJECT_KEYS)), np.nan)   # last row: missing names
+    for u, name in enumerate(uniques):
+        for col, rank in match_subject(str(name)).items():
+            table[u, col] = rank
+    return table[codes]
+
+
 def extract_subject_scores(df):
-    subjects = {
-        "math": ["MATH", "MATHEMATICS"],
-        "physics": ["PHYSICS"],
-        "chemistry": ["CHEMISTRY"],
-        "biology": ["BIOLOGY"],
-        "computer": ["COMPUTER"],
-        "english": ["ENGLISH"],
-        "urdu": ["URDU"],
-        "islamiat": ["ISLAM", "ISLAMIYAT"],
-        "pakstudies": ["PAKISTAN"]
-    }
+    ranks = map_subjects(df["subject"])
+    marks = df["marks"].to_numpy()
 
     extracted = {}
-
-    for key, keywords in subjects.items():
+    for col, key in enumerate(SUBJECT_KEYS):
         extracted[key] = 0  # default
-        for kw in keywords:
-            row = df[df["subject"].str.contains(kw, case=False)]
-            if len(row) > 0:
-                extracted[key] = int(row.iloc[0]["marks"])
-                break
+        key_ranks = ranks[:, col]
+        if not np.isnan(key_ranks).all():
+            # Best keyword first, then the first row with it
+            extracted[key] = int(marks[np.flatnonzero(key_ranks == np.nanmin(key_ranks))[0]])
 
     return extracted
 
 
+# ----------------------------------------------
+# COHORT VERSIONS (MANY STUDENTS AT ONCE)
+# ----------------------------------------------
+def load_marksheet_cohort(csv_path):
+    # Same cleaning as load_marksheet, but keeps one row per (student, subject)
+    if storage.is_columnar(csv_path):
+        df = storage.read_marks(columns=["student_id", "subject", "obtained"], root=csv_path)
+        df = df.rename(columns={"obtained": "marks"})
+    else:
+        df = pd.read_csv(csv_path, usecols=["id", "Subject", "Obtained"])
+    return prepare_marksheet_cohort(df)
+
+
+def prepare_marksheet_cohort(df):
+    df = df.rename(columns={"id": "student_id", "Obtained": "marks", "Subject": "subject"})
+    df = df[["student_id", "subject", "marks"]].copy()
+    df = df[~df["subject"].str.contains("TOTAL", case=False)]  # remove TOTAL rows
+    df["subject"] = df["subject"].str.upper().str.strip()
+    df["student_id"] = df["student_id"].astype(str)
+    df = df.groupby(["student_id", "subject"])["marks"].max().reset_index()   # handle duplicates
+    return df
+
+
+def extract_subject_scores_cohort(df):
+    """
+    df: long table (student_id, subject, marks) from prepare_marksheet_cohort
+    Returns a wide table indexed by student_id with one column per subject key,
+    picking rows exactly like extract_subject_scores does per student.
+    """
+    student_codes, students = pd.factorize(df["student_id"])
+    marks = df["marks"].to_numpy(dtype="float64")
+    wide = np.zeros((len(students), len(SUBJECT_KEYS)))
+
+    ranks = map_subjects(df["subject"])
+    for col in range(len(SUBJECT_KEYS)):
+        hit = np.flatnonzero(~np.isnan(ranks[:, col]))
+        # Per student: best keyword first, then the first matching row
+        # (rows are sorted by subject, like extract_subject_scores sees them)
+        rows = hit[np.lexsort((hit, ranks[hit, col], student_codes[hit]))]
+        codes = student_codes[rows]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = codes[1:] != codes[:-1]
+        wide[codes[first], col] = marks[rows[first]]
+
+    return pd.DataFrame(wide, index=pd.Index(students, name="student_id"), columns=SUBJECT_KEYS)
+
+
+def personality_matrix(p):
+    # Missing trait columns score 0, like personality.get(trait, 0)
+    return p.reindex(columns=PERSONALITY_TRAITS, fill_value=0).to_numpy(dtype="float64")
+
+
+def recommend_cohort(personality_csv, marksheet_csv, output_csv=None):
+    """
+    Batch version of recommend_field for every student in both files.
+    personality_csv: response.csv-style rows keyed by user_id, or a storage.py results dataset
+    marksheet_csv: merged marksheet table keyed by id, or a storage.py marks dataset (see merge_marksheets)
+    Returns (and optionally writes) one row per student: best field + field probabilities.
+    """
+    p = load_personality(personality_csv, columns=["user_id", "created_at"] + PERSONALITY_TRAITS)
+    p["student_id"] = p["student_id"].astype(str)
+    if "created_at" in p.columns:
+        p = p.sort_values("created_at")
+    p = p.drop_duplicates("student_id", keep="last").set_index("student_id")   # latest attempt
+
+    marks = extract_subject_scores_cohort(load_marksheet_cohort(marksheet_csv))
+
+    # Only students with both a test result and a marksheet can be scored
+    ids = marks.index.intersection(p.index)
+    marks = marks.loc[ids, MARK_SUBJECTS].to_numpy()
+    personality = personality_matrix(p.loc[ids])
+
+    probs = score_cohort(marks, personality).round(3)
+    best = np.asarray(FIELDS)[probs.argmax(axis=1)]
+
+    results = pd.DataFrame(probs, columns=FIELDS, index=ids).reset_index()
+    results.insert(1, "best_field", best)
+
+    if output_csv:
+        results.to_csv(output_csv, index=False)
+        print(f"💾 Recommendations for {len(results)} students saved to {output_csv}")
+
+    return results
+
+
 # ----------------------------------------------
 # RULE-BASED SCORING SYSTEM
 # ----------------------------------------------
+FIELDS = ["Medical", "Engineering", "Computer Science", "Arts", "Business", "Commerce"]
+
+# Marks are out of 150
+MAX_MARKS = 150
+MARK_SUBJECTS = ["math", "physics", "chemistry", "biology", "computer", "english", "urdu"]
+
+# -------------------------
+# MARKS WEIGHTS (field relevance): subject x field
+# -------------------------
+MARKS_WEIGHTS = np.array([
+    # Med   Eng   CS    Arts  Bus   Com
+    [0.10, 0.35, 0.30, 0.10, 0.20, 0.30],   # math
+    [0.10, 0.35, 0.20, 0.10, 0.20, 0.15],   # physics
+    [0.35, 0.10, 0.00, 0.05, 0.05, 0.05],   # chemistry
+    [0.35, 0.05, 0.05, 0.05, 0.05, 0.05],   # biology
+    [0.00, 0.00, 0.25, 0.00, 0.00, 0.00],   # computer
+    [0.05, 0.05, 0.10, 0.40, 0.30, 0.25],   # english
+    [0.05, 0.10, 0.10, 0.30, 0.20, 0.20],   # urdu
+])
+
+# -------------------------
+# PERSONALITY / RIASEC WEIGHTS: trait x field
+# personality scores assumed 0-5 scale; each field adds
+# ((trait_a + trait_b) / 10) * 0.3 for its two traits
+# -------------------------
+PERSONALITY_TRAITS = ["riasec_I", "riasec_A", "riasec_C", "riasec_E",
+                      "tci_NoveltySeeking", "tci_RewardDependence"]
+TRAIT_WEIGHTS = np.array([
+    # Med Eng CS  Arts Bus Com
+    [1,   1,  0,  0,   0,  0],   # riasec_I
+    [1,   0,  0,  1,   0,  0],   # riasec_A
+    [0,   1,  1,  0,   0,  1],   # riasec_C
+    [0,   0,  0,  1,   1,  1],   # riasec_E
+    [0,   0,  1,  0,   0,  0],   # tci_NoveltySeeking
+    [0,   0,  0,  0,   1,  0],   # tci_RewardDependence
+]) * (0.3 / 10)
+
+
+def score_cohort(marks, personality):
+    """
+    marks: (N, len(MARK_SUBJECTS)) array of obtained marks
+    personality: (N, len(PERSONALITY_TRAITS)) array of trait scores
+    Returns an (N, len(FIELDS)) array of probabilities (each row sums to 1)
+    """
+    marks = np.asarray(marks, dtype=np.float64)
+    personality = np.asarray(personality, dtype=np.float64)
+    scores = (marks / MAX_MARKS) @ MARKS_WEIGHTS + personality @ TRAIT_WEIGHTS
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
 def calculate_best_fit(marks, personality):
     """
     marks: dict, e.g. {"math": 147, "physics":147, "biology":147, "chemistry":138, "english":137, "urdu":131, "computer":130}
     personality: dict, RIASEC + TCI scores scaled 0-5 or 0-100
     Returns: dict of normalized probabilities for each field
     """
+    marks_row = [[marks[s] for s in MARK_SUBJECTS]]
+    personality_row = [[personality.get(t, 0) for t in PERSONALITY_TRAITS]]
+    probs = score_cohort(marks_row, personality_row)[0]
 
-    # Initialize raw scores
-    scores = {
-        "Medical": 0,
-        "Engineering": 0,
-        "Computer Science": 0,
-        "Arts": 0,
-        "Business": 0,
-        "Commerce": 0
-    }
-
-    # -------------------------
-    # MARKS WEIGHTS (field relevance)
-    # -------------------------
-    scores["Medical"] += (marks["biology"]/150)*0.35 + (marks["chemistry"]/150)*0.35 + (marks["physics"]/150)*0.1 + (marks["math"]/150)*0.1 + (marks["english"]/150)*0.05 + (marks["urdu"]/150)*0.05
-    scores["Engineering"] += (marks["math"]/150)*0.35 + (marks["physics"]/150)*0.35 + (marks["chemistry"]/150)*0.1 + (marks["biology"]/150)*0.05 + (marks["english"]/150)*0.05 + (marks["urdu"]/150)*0.1
-    scores["Computer Science"] += (marks["math"]/150)*0.3 + (marks["physics"]/150)*0.2 + (marks["computer"]/150)*0.25 + (marks["english"]/150)*0.1 + (marks["biology"]/150)*0.05 + (marks["urdu"]/150)*0.1
-    scores["Arts"] += (marks["english"]/150)*0.4 + (marks["urdu"]/150)*0.3 + (marks["biology"]/150)*0.05 + (marks["chemistry"]/150)*0.05 + (marks["math"]/150)*0.1 + (marks["physics"]/150)*0.1
-    scores["Business"] += (marks["math"]/150)*0.2 + (marks["english"]/150)*0.3 + (marks["urdu"]/150)*0.2 + (marks["biology"]/150)*0.05 + (marks["chemistry"]/150)*0.05 + (marks["physics"]/150)*0.2
-    scores["Commerce"] += (marks["math"]/150)*0.3 + (marks["english"]/150)*0.25 + (marks["urdu"]/150)*0.2 + (marks["biology"]/150)*0.05 + (marks["chemistry"]/150)*0.05 + (marks["physics"]/150)*0.15
-
-    # -------------------------
-    # PERSONALITY / RIASEC WEIGHTS
-    # personality scores assumed 0-5 scale
-    # -------------------------
-    scores["Medical"] += ((personality.get("riasec_I",0) + personality.get("riasec_A",0))/10) * 0.3
-    scores["Engineering"] += ((personality.get("riasec_I",0) + personality.get("riasec_C",0))/10) * 0.3
-    scores["Computer Science"] += ((personality.get("riasec_C",0) + personality.get("tci_NoveltySeeking",0))/10) * 0.3
-    scores["Arts"] += ((personality.get("riasec_A",0) + personality.get("riasec_E",0))/10) * 0.3
-    scores["Business"] += ((personality.get("riasec_E",0) + personality.get("tci_RewardDependence",0))/10) * 0.3
-    scores["Commerce"] += ((personality.get("riasec_E",0) + personality.get("riasec_C",0))/10) * 0.3
-
-    # -------------------------
-    # NORMALIZE SCORES TO PROBABILITIES
-    # -------------------------
-    total_score = sum(scores.values())
-    probabilities = {field: round(score/total_score, 3) for field, score in scores.items()}
+    probabilities = {field: round(float(p), 3) for field, p in zip(FIELDS, probs)}
 
     # Sort by highest probability
     probabilities = dict(sorted(probabilities.items(), key=lambda x: x[1], reverse=True))
@@ -172,6 +363,33 @@ def calculate_best_fit(marks, personality):
 
 
 
+# ----------------------------------------------
+# PERSONALITY FROM IN-APP TEST SCORES
+# ----------------------------------------------
+def personality_from_scores(riasec, tci):
+    """
+    riasec: {"R": 3.2, "I": 4.0, ...}, tci: {"Novelty Seeking": 2, ...}
+    Returns the response.csv-style dict calculate_best_fit expects
+    ({"riasec_I": 4.0, "tci_NoveltySeeking": 2, ...}).
+    """
+    personality = {}
+    for category, score in (riasec or {}).items():
+        personality[f"riasec_{category}"] = score
+    for trait, score in (tci or {}).items():
+        personality["tci_" + trait.replace(" ", "").replace("-", "")] = score
+    return personality
+
+
+# ----------------------------------------------
+# RECOMMEND FROM DATA ALREADY IN MEMORY
+# ----------------------------------------------
+def recommend(marks_df, personality):
+    marks = extract_subject_scores(prepare_marksheet(marks_df))
+    field_scores = calculate_best_fit(marks, personality)
+    best_field = max(field_scores, key=field_scores.get)
+    return best_field, SUBFIELDS[best_field], field_scores
+
+
 # ----------------------------------------------
 # MAIN FUNCTION
 # ----------------------------------------------
@@ -205,4 +423,5 @@ def recommend_field(personality_csv, marksheet_csv):
 
 # give there your response file path 
 
-    recommend_field("/content/response.csv", "marksheet_merged.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    recommend_field("/content/response.csv", "marksheet_merged.csv")
@@ -1,23 +1,84 @@
-!pip install paddlepaddle -i https://pypi.tuna.tsinghua.edu.cn/simple
-!pip install paddleocr opencv-python pandas
+# Dependencies (paddlepaddle, paddleocr, opencv, pandas) are listed in requirements.txt
+
+import os
+import re
+import threading
+import time
 
 import cv2
 import numpy as np
 import pandas as pd
-from paddleocr import PaddleOCR
-import re
+
+import ocr_cache
+
+# Bump when parse_marks or marksheet_templates change so cached parsed tables
+# are recomputed (the cached raw OCR text stays valid).
+PARSER_VERSION = "3"
 
 # ------------------------------------------------------------
 # 1) Load & preprocess image to fix blur/noise/lighting
 # ------------------------------------------------------------
-def preprocess_image(path):
-    img = cv2.imread(path)
+def load_image(source):
+    # Accepts a file path, raw encoded bytes (e.g. a Streamlit upload) or an
+    # already decoded BGR array.
+    if isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        img = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_COLOR)
+    else:
+        img = cv2.imread(str(source))
+    if img is None:
+        raise ValueError("Could not read marksheet image")
+    return img
+
+# Preprocessing modes, cheapest first. Each mode runs only the stages it needs:
+#   none      - decode only
+#   downscale - shrink to TARGET_DPI
+#   denoise   - downscale + grayscale + bilateral filter
+#   binarize  - downscale + grayscale + bilateral filter + adaptive threshold
+# PaddleOCR reads the colour image, so the OCR path only needs "downscale";
+# the gray/binary outputs are for layout consumers.
+PREPROCESS_MODES = ("none", "downscale", "denoise", "binarize")
+OCR_PREPROCESS_MODE = "downscale"
+
+# Marksheets are A4; resolution beyond ~200 DPI only slows OCR down
+# (12-MP phone photos are ~350 DPI over the page).
+TARGET_DPI = 200
+PAGE_LONG_SIDE_INCHES = 11.69
+
+def downscale_to_dpi(img, target_dpi=TARGET_DPI):
+    if not target_dpi:
+        return img
+    max_side = int(target_dpi * PAGE_LONG_SIDE_INCHES)
+    h, w = img.shape[:2]
+    if max(h, w) <= max_side:
+        return img
+    scale = max_side / max(h, w)
+    return cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+
+def preprocess_image(path, mode="binarize", target_dpi=TARGET_DPI):
+    """
+    Returns (img, aux): img is the colour image to OCR, aux is the denoised
+    grayscale ("denoise"), the binary mask ("binarize") or None.
+    """
+    if mode not in PREPROCESS_MODES:
+        raise ValueError(f"Unknown preprocess mode: {mode!r}")
+
+    img = load_image(path)
+    if mode == "none":
+        return img, None
+
+    img = downscale_to_dpi(img, target_dpi)
+    if mode == "downscale":
+        return img, None
 
     # Convert to grayscale
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
     # Remove noise
     gray = cv2.bilateralFilter(gray, 9, 75, 75)
+    if mode == "denoise":
+        return img, gray
 
     # Adaptive threshold (works for colored/noisy marksheets)
     thresh = cv2.adaptiveThreshold(
@@ -29,13 +90,98 @@ def preprocess_image(path):
 
     return img, thresh
 
+# ------------------------------------------------------------
+# 1b) Find the marks table so only that crop goes to OCR
+# ------------------------------------------------------------
+# Headers, photos, seals and footers are never parsed, so recognition runs on
+# the ruled marks table only. Layout detection works on a small binary copy
+# of the page, which costs a few milliseconds.
+OCR_USE_ROI = True
+LAYOUT_MAX_SIDE = 1000
+ROI_MIN_AREA = 0.08   # table must cover at least 8% of the page ...
+ROI_MAX_AREA = 0.90   # ... and less than the decorative page border
+ROI_MIN_ROWS = 3      # and be crossed by at least 3 ruling lines
+ROI_PADDING = 0.02
+
+def detect_marks_region(img, thresh=None):
+    """
+    Return (x, y, w, h) of the marks table in img coordinates, or None if no
+    ruled table is found. thresh may be the binary mask from
+    preprocess_image(mode="binarize"); otherwise a cheap low-res one is built.
+    """
+    h, w = img.shape[:2]
+    if thresh is None:
+        scale = min(1.0, LAYOUT_MAX_SIDE / max(h, w))
+        small = cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA) if scale < 1 else img
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY_INV, 15, 10)
+    th, tw = thresh.shape[:2]
+    scale_back = w / tw
+
+    # Ruling lines: keep only long horizontal and vertical strokes
+    horiz = cv2.morphologyEx(thresh, cv2.MORPH_OPEN,
+                             cv2.getStructuringElement(cv2.MORPH_RECT, (max(tw // 15, 10), 1)))
+    vert = cv2.morphologyEx(thresh, cv2.MORPH_OPEN,
+                            cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(th // 30, 10))))
+    grid = cv2.dilate(cv2.add(horiz, vert), np.ones((3, 3), np.uint8), iterations=2)
+
+    contours, _ = cv2.findContours(grid, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    page_area = tw * th
+    best = None
+    for c in contours:
+        x, y, cw, ch = cv2.boundingRect(c)
+        area = cw * ch
+        if not (ROI_MIN_AREA * page_area <= area <= ROI_MAX_AREA * page_area):
+            continue
+        # Count separate horizontal rules crossing the candidate
+        profile = horiz[y:y + ch, x:x + cw].any(axis=1)
+        rows = int(profile[0]) + np.count_nonzero(profile[1:] & ~profile[:-1])
+        if rows < ROI_MIN_ROWS:
+            continue
+        if best is None or area > best[2] * best[3]:
+            best = (x, y, cw, ch)
+
+    if best is None:
+        return None
+
+    x, y, cw, ch = best
+    pad_x, pad_y = int(tw * ROI_PADDING), int(th * ROI_PADDING)
+    x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+    x1, y1 = min(x + cw + pad_x, tw), min(y + ch + pad_y, th)
+    return (round(x0 * scale_back), round(y0 * scale_back),
+            round((x1 - x0) * scale_back), round((y1 - y0) * scale_back))
+
+def crop_to_marks_region(img, thresh=None):
+    region = detect_marks_region(img, thresh)
+    if region is None:
+        return img  # no ruled table found, OCR the whole page
+    x, y, w, h = region
+    return img[y:y + h, x:x + w]
+
 # ------------------------------------------------------------
 # 2) OCR detection using PaddleOCR (much more accurate)
 # ------------------------------------------------------------
-ocr = PaddleOCR(use_angle_cls=True, lang='en')
+# The model is built on first use, not at import, so pages that never reach
+# the marksheet step don't pay for it. Call warm_up() to load it up front.
+_ocr = None
+_ocr_lock = threading.Lock()
+
+def get_ocr():
+    global _ocr
+    if _ocr is None:
+        with _ocr_lock:
+            if _ocr is None:
+                from paddleocr import PaddleOCR
+                _ocr = PaddleOCR(use_angle_cls=True, lang='en')
+    return _ocr
+
+def warm_up():
+    """Load the OCR model now (e.g. at server start) instead of on the first upload."""
+    get_ocr()
 
 def extract_text(img):
-    result = ocr.ocr(img)
+    result = get_ocr().ocr(img)
     text_data = []
     if result and result[0]: # Check if result is not empty and has detections for the first image
         # PaddleOCR can return a list of dictionaries with results per image, or a list of detection tuples.
@@ -67,10 +213,12 @@ def extract_text(img):
 # ------------------------------------------------------------
 # Helper for robust number extraction
 # ------------------------------------------------------------
+# First sequence of digits, optionally with a decimal point
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+_ALPHA_RE = re.compile(r'[a-zA-Z]{2,}')
+
 def extract_number_robust(s):
-    s = str(s).strip()
-    # Find the first sequence of digits, optionally with a decimal point
-    match = re.search(r'\d+\.?\d*', s)
+    match = _NUMBER_RE.search(str(s).strip())
     if match:
         try:
             return float(match.group(0)) if '.' in match.group(0) else int(match.group(0))
@@ -81,107 +229,123 @@ def extract_number_robust(s):
 # ------------------------------------------------------------
 # 3) Convert extracted text into "Subject | Max | Obtained"
 # ------------------------------------------------------------
+HEADER_ANCHOR = 'SUBJECT - WISE STATEMENT OF MARKS'
+
+# Keywords to ignore when identifying subjects or as noise
+FORBIDDEN_SUBJECT_KEYWORDS = frozenset({'SR.NO.', 'SR.NO', 'SUBJECTS', 'MARKS', 'MAXIMUM', 'OBTAINED', 'ANNUAL', 'NO CERTIFICATE'})
+# Single-letter/short strings often misidentified by OCR or irrelevant from the provided raw OCR
+NOISE_WORDS = frozenset(w.lower() for w in {'L', 'E', 'a', 'b', 'c', 'd', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', '1', '2', '3', '4', '5', '6', '7', '8', '9', '100', 'FIRST'})
+# Allow specific subjects regardless of strict alpha check or length if they are explicitly known
+SPECIFIC_SUBJECTS_KEYWORDS = ["URDU", "ENGLISH", "ISLAMIYAT", "PAKISTAN STUDIES", "MATHEMATICS", "PHYSICS", "CHEMISTRY", "BIOLOGY", "TOTAL"]
+_SPECIFIC_SUBJECTS_RE = re.compile('|'.join(re.escape(k) for k in SPECIFIC_SUBJECTS_KEYWORDS))
+
+# Token kinds produced by tokenize_marks()
+TOKEN_NOISE = 0    # empty, forbidden keyword, noise word or too short
+TOKEN_OTHER = 1    # anything else (numbers, names, dates ...)
+TOKEN_SUBJECT = 2  # plausible subject name
+TOKEN_TOTAL = 3    # the TOTAL row label
+TOKEN_HEADER = 4   # the marks table header anchor
+
+def tokenize_marks(text_list):
+    """
+    Classify every OCR token exactly once.
+    Returns (texts, kinds, nums, next_num, start):
+      texts    - stripped token text
+      kinds    - bytearray of TOKEN_* codes
+      nums     - first number in each token, or None
+      next_num - next_num[j] is the first index >= j holding a number (len(texts) if none)
+      start    - index to start parsing from (just after the header anchor, or 0)
+    """
+    n = len(text_list)
+    texts = [None] * n
+    nums = [None] * n
+    kinds = bytearray(n)
+    start = -1
+
+    for idx, token in enumerate(text_list):
+        raw = str(token).strip()
+        upper = raw.upper()
+        texts[idx] = raw
+        nums[idx] = extract_number_robust(raw)
+
+        if start == -1 and HEADER_ANCHOR in upper:
+            kinds[idx] = TOKEN_HEADER
+            start = idx + 1
+        elif not raw or len(raw) < 2 or upper in FORBIDDEN_SUBJECT_KEYWORDS or raw.lower() in NOISE_WORDS:
+            kinds[idx] = TOKEN_NOISE
+        elif upper == 'TOTAL':
+            kinds[idx] = TOKEN_TOTAL
+        elif _ALPHA_RE.search(raw) or _SPECIFIC_SUBJECTS_RE.search(upper):
+            kinds[idx] = TOKEN_SUBJECT
+        else:
+            kinds[idx] = TOKEN_OTHER
+
+    next_num = [n] * (n + 1)
+    for idx in range(n - 1, -1, -1):
+        next_num[idx] = idx if nums[idx] is not None else next_num[idx + 1]
+
+    return texts, kinds, nums, next_num, max(start, 0)
+
 def parse_marks(text_list):
     subjects = []
     maximum = []
     obtained = []
 
-    # Find the starting point of the actual marks table
-    start_parsing_from_index = -1
-    for idx, text in enumerate(text_list):
-        if 'SUBJECT - WISE STATEMENT OF MARKS' in text.upper():
-            start_parsing_from_index = idx
-            break
+    texts, kinds, nums, next_num, i = tokenize_marks(text_list)
+    n = len(texts)
 
-    if start_parsing_from_index != -1:
-        i = start_parsing_from_index + 1 # Start from the item after the header
-    else:
-        i = 0 # Fallback to start from beginning if header not found
+    while i < n:
+        kind = kinds[i]
+
+        # Special handling for 'TOTAL' as its numbers are sometimes out of immediate sequence
+        if kind == TOKEN_TOTAL:
+            # Take the next 3 numbers wherever they are, for safety
+            potential_total_nums = []
+            j = next_num[i + 1]
+            while j < n and len(potential_total_nums) < 3:
+                potential_total_nums.append((nums[j], j))
+                j = next_num[j + 1]
 
-    # Keywords to ignore when identifying subjects or as noise
-    forbidden_subject_keywords = {'SR.NO.', 'SR.NO', 'SUBJECTS', 'MARKS', 'MAXIMUM', 'OBTAINED', 'ANNUAL', 'NO CERTIFICATE'}
-    # Single-letter/short strings often misidentified by OCR or irrelevant from the provided raw OCR
-    noise_words = {'L', 'E', 'a', 'b', 'c', 'd', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', '1', '2', '3', '4', '5', '6', '7', '8', '9', '100', 'FIRST'}
+            if len(potential_total_nums) >= 2:
+                # For 'TOTAL', we want the largest two numbers (Total Max and Total Obtained)
+                # Example: 'TOTAL', '49', '850', '426'. We want 850 and 426.
+                potential_total_nums.sort(key=lambda x: x[0], reverse=True)
 
-    while i < len(text_list):
-        t1_raw = text_list[i].strip()
-        t1_upper = t1_raw.upper()
+                subjects.append(texts[i])
+                maximum.append(int(potential_total_nums[0][0]))
+                obtained.append(int(potential_total_nums[1][0]))
+
+                # Advance 'i' past the highest index of the numbers used
+                i = max(potential_total_nums[0][1], potential_total_nums[1][1]) + 1
+            else:
+                i += 1
+            continue
 
-        # Skip empty strings or known noise words/forbidden keywords
-        if not t1_raw or t1_upper in forbidden_subject_keywords or t1_raw.lower() in [nw.lower() for nw in noise_words] or len(t1_raw) < 2 and not t1_upper == 'TOTAL':
+        if kind != TOKEN_SUBJECT:
             i += 1
             continue
 
-        # Check if t1 is a plausible subject
-        is_plausible_subject = False
-        # A subject should contain at least two alphabetic characters and not be a forbidden/noise word
-        if re.search(r'[a-zA-Z]{2,}', t1_raw) and \
-           t1_upper not in forbidden_subject_keywords and \
-           t1_raw.lower() not in [nw.lower() for nw in noise_words]:
-            is_plausible_subject = True
-
-        # Allow specific subjects regardless of strict alpha check or length if they are explicitly known
-        specific_subjects_keywords = ["URDU", "ENGLISH", "ISLAMIYAT", "PAKISTAN STUDIES", "MATHEMATICS", "PHYSICS", "CHEMISTRY", "BIOLOGY", "TOTAL"]
-        if any(ss in t1_upper for ss in specific_subjects_keywords):
-             is_plausible_subject = True
-
-        if is_plausible_subject:
-            subject_name = t1_raw
-
-            # Special handling for 'TOTAL' as its numbers are sometimes out of immediate sequence
-            if t1_upper == 'TOTAL':
-                potential_total_nums = []
-                scan_idx = i + 1
-                while scan_idx < len(text_list) and len(potential_total_nums) < 3: # Scan up to 3 numbers for safety
-                    num = extract_number_robust(text_list[scan_idx])
-                    if num is not None:
-                        potential_total_nums.append((num, scan_idx)) # Store number and its original index
-                    scan_idx += 1
-
-                if len(potential_total_nums) >= 2:
-                    # For 'TOTAL', we want the largest two numbers (Total Max and Total Obtained)
-                    # Example: 'TOTAL', '49', '850', '426'. We want 850 and 426.
-                    # Sort by value to easily pick the max and obtained
-                    potential_total_nums.sort(key=lambda x: x[0], reverse=True)
-
-                    subjects.append(subject_name)
-                    maximum.append(int(potential_total_nums[0][0])) # Largest number
-                    obtained.append(int(potential_total_nums[1][0])) # Second largest number
-
-                    # Advance 'i' past the highest index of the numbers used
-                    max_k_used = max(item[1] for item in potential_total_nums[:2])
-                    i = max_k_used + 1
-                else:
-                    i += 1 # Not enough numbers for total, skip
+        # For regular subjects, look for two numbers within the next 4 items
+        found_nums = []
+        last_num_idx = i
+        for j in range(i + 1, min(i + 5, n)):
+            num = nums[j]
+            if num is None:
                 continue
-
-            # For regular subjects, look for two numbers immediately after the subject name
-            found_nums = []
-            last_num_idx = i
-            scan_idx = i + 1
-            num_search_count = 0 # To limit how far we scan for numbers
-            while scan_idx < len(text_list) and len(found_nums) < 2 and num_search_count < 4: # Scan up to 4 items ahead
-                num = extract_number_robust(text_list[scan_idx])
-                if num is not None and num >= 0:
-                    # Heuristic to skip potential serial numbers (small number after Max and before another mark)
-                    if len(found_nums) == 1 and num < 10 and (scan_idx + 1 < len(text_list)) and extract_number_robust(text_list[scan_idx+1]) is not None:
-                        print(f"Skipping potential serial number: {num} for subject {subject_name}") # For debugging
-                        # Don't append, just advance scan_idx
-                    else:
-                        found_nums.append(num)
-                    last_num_idx = scan_idx
-                scan_idx += 1
-                num_search_count += 1
-
-            if len(found_nums) >= 2: # Ensure at least two numbers are found
-                subjects.append(subject_name)
-                maximum.append(int(found_nums[0]))
-                obtained.append(int(found_nums[1]))
-                i = last_num_idx + 1 # Advance index past the last number used
-            else:
-                i += 1 # Not enough numbers for subject marks, advance one position
+            # Heuristic to skip potential serial numbers (small number after Max and before another mark)
+            if not (len(found_nums) == 1 and num < 10 and j + 1 < n and nums[j + 1] is not None):
+                found_nums.append(num)
+            last_num_idx = j
+            if len(found_nums) == 2:
+                break
+
+        if len(found_nums) == 2:
+            subjects.append(texts[i])
+            maximum.append(int(found_nums[0]))
+            obtained.append(int(found_nums[1]))
+            i = last_num_idx + 1 # Advance index past the last number used
         else:
-            i += 1 # Not a subject candidate, move to next item.
+            i += 1 # Not enough numbers for subject marks, advance one position
 
     df = pd.DataFrame({
         "Subject": subjects,
@@ -191,31 +355,158 @@ def parse_marks(text_list):
 
     return df
 
+def parse_marksheet(text_list):
+    # Board-specific template when one matches, parse_marks otherwise
+    import marksheet_templates
+    return marksheet_templates.parse(text_list)
+
 # ------------------------------------------------------------
-# 4) MAIN FUNCTION
+# 4) Multi-page PDF marksheets, one page in memory at a time
 # ------------------------------------------------------------
-def extract_marks_from_marksheet(image_path, output_csv=None):
-    img, thresh = preprocess_image(image_path)
-
-    print("🔍 Running OCR...")
-    text_list = extract_text(img)
-
-    print("📄 Raw OCR Text:")
-    print(text_list)
+PDF_DPI = TARGET_DPI
+
+def is_pdf(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:5]) == b"%PDF-"
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source).lower().endswith(".pdf")
+    return False
+
+def iter_pdf_pages(source, dpi=PDF_DPI):
+    """Rasterize a PDF (path or bytes) lazily, yielding one BGR page image at a time."""
+    import pypdfium2 as pdfium
+
+    if isinstance(source, (bytearray, memoryview)):
+        source = bytes(source)
+    pdf = pdfium.PdfDocument(source)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            try:
+                bitmap = page.render(scale=dpi / 72)
+                # Copy out of pdfium's buffer so the page can be freed right away
+                img = bitmap.to_numpy().copy()
+                bitmap.close()
+            finally:
+                page.close()
+
+            if img.ndim == 3 and img.shape[2] == 4:
+                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+            elif img.ndim == 2:
+                img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+            yield img
+            del img
+    finally:
+        pdf.close()
+
+def iter_pdf_text(source, dpi=PDF_DPI):
+    # Pages are OCR'd as soon as they are rasterized; only the page being
+    # processed is ever held as an image.
+    for page_no, img in enumerate(iter_pdf_pages(source, dpi), start=1):
+        if OCR_USE_ROI:
+            img = crop_to_marks_region(img)
+        print(f"🔍 Running OCR on page {page_no}...")
+        yield extract_text(img)
+
+def parse_pages(page_texts):
+    # Each page is parsed on its own (only the first page carries the table
+    # header) and the page tables are merged into one marks table.
+    frames = [parse_marksheet(texts) for texts in page_texts]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return parse_marks([])
+    return pd.concat(frames, ignore_index=True)
 
-    df = parse_marks(text_list)
-
-    print("\n📊 Extracted Marks:")
-    print(df)
+# ------------------------------------------------------------
+# 5) MAIN FUNCTION
+# ------------------------------------------------------------
+def read_image_bytes(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+def raw_cache_key(digest, mode=OCR_PREPROCESS_MODE, target_dpi=TARGET_DPI, roi=OCR_USE_ROI):
+    # The OCR text depends on what the model was shown, so the preprocessing
+    # settings are part of the raw-layer key.
+    return f"{digest}-{mode}-{target_dpi or 0}" + ("-roi" if roi else "")
+
+def _run_ocr(image, pdf=False):
+    # For PDFs this returns one text list per page
+    if pdf:
+        return list(iter_pdf_text(image))
+
+    img, _ = preprocess_image(image, mode=OCR_PREPROCESS_MODE)
+    if OCR_USE_ROI:
+        img = crop_to_marks_region(img)
+    return extract_text(img)
+
+def cache_key(data, pdf=None):
+    digest = ocr_cache.image_digest(data)
+    pdf = is_pdf(data) if pdf is None else pdf
+    return raw_cache_key(digest, "pdf", PDF_DPI) if pdf else raw_cache_key(digest)
+
+def cached_marks(data, cache):
+    """Marks table for an already processed upload, or None; never runs OCR."""
+    return cache.get_parsed(cache_key(data), PARSER_VERSION)
+
+def extract_marks_from_marksheet(image_path, output_csv=None, cache=None, timings=None,
+                                 verbose=True):
+    """
+    image_path: file path or raw bytes of an image or a PDF
+    cache: optional ocr_cache.OCRCache; re-uploads of the same file skip
+           preprocessing and OCR, and skip parsing too if the parser is unchanged
+    timings: optional dict filled with per-stage seconds ("ocr", "parse")
+             and "cache_hit" when a cache is given
+    """
+    timings = {} if timings is None else timings
+    pdf = is_pdf(image_path)
+    df = None
+    if cache is None:
+        if verbose:
+            print("🔍 Running OCR...")
+        t = time.perf_counter()
+        text_list = _run_ocr(image_path, pdf)
+        timings["ocr"] = time.perf_counter() - t
+    else:
+        data = read_image_bytes(image_path)
+        key = cache_key(data, pdf)
+        df = cache.get_parsed(key, PARSER_VERSION)
+        text_list = cache.get_raw(key) if df is None else None
+        timings["cache_hit"] = df is not None or text_list is not None
+        if df is None and text_list is None:
+            if verbose:
+                print("🔍 Running OCR...")
+            t = time.perf_counter()
+            text_list = _run_ocr(data, pdf)
+            timings["ocr"] = time.perf_counter() - t
+            cache.put_raw(key, text_list)
+
+    if df is None:
+        if verbose:
+            print("📄 Raw OCR Text:")
+            print(text_list)
+
+        t = time.perf_counter()
+        df = parse_pages(text_list) if pdf else parse_marksheet(text_list)
+        timings["parse"] = time.perf_counter() - t
+        if cache is not None:
+            cache.put_parsed(key, PARSER_VERSION, df)
+
+    if verbose:
+        print("\n📊 Extracted Marks:")
+        print(df)
 
     if output_csv:
         df.to_csv(output_csv, index=False)
-        print(f"\n💾 Marks saved to {output_csv}")
+        if verbose:
+            print(f"\n💾 Marks saved to {output_csv}")
 
     return df
 
 
 # ------------------------------------------------------------
-# 5) Run on your marksheet
+# 6) Run on your marksheet
 # ------------------------------------------------------------
-extract_marks_from_marksheet("/content/IMG_20210617_120733.jpg", output_csv='marksheet_marks.csv')
\ No newline at end of file
+if __name__ == "__main__":
+    extract_marks_from_marksheet("/content/IMG_20210617_120733.jpg", output_csv='marksheet_marks.csv')
\ No newline at end of file
@@ -0,0 +1,79 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import db
+
+# ------------------------------------------------------------
+# Counselor analytics: score distributions for the whole school or one cohort
+#
+#   streamlit run analytics.py
+#
+# Reads only the aggregate tables that db.py keeps up to date on every
+# saved result (db.cohort_summary / db.cohorts), so page loads cost the
+# same whether skillbot.db holds a hundred results or a million.
+# ------------------------------------------------------------
+st.set_page_config(page_title="SkillBot Cohort Analytics", layout="wide")
+
+SCOPE_LABELS = {"All students": "all", "School": "school", "Class": "education"}
+
+st.title("📈 SkillBot Cohort Analytics")
+
+# -------------------- COHORT PICKER --------------------
+left, right = st.columns(2)
+scope = SCOPE_LABELS[left.radio("Group by", list(SCOPE_LABELS), horizontal=True)]
+cohort = ""
+if scope != "all":
+    available = db.cohorts(scope)
+    if not available:
+        st.info("No results saved yet.")
+        st.stop()
+    cohort = right.selectbox(
+        "Cohort", list(available),
+        format_func=lambda c: f"{c or '(not given)'} — {available[c]} students",
+    )
+
+summary = db.cohort_summary(scope, cohort)
+if not summary["means"]:
+    st.info("No results saved yet.")
+    st.stop()
+
+# -------------------- MEANS --------------------
+st.subheader("Average scores")
+columns = st.columns(len(db.SCORE_COLUMNS))
+for column, test_type in zip(columns, db.SCORE_COLUMNS):
+    means = summary["means"].get(test_type)
+    if not means:
+        column.caption(f"No {test_type.upper()} results.")
+        continue
+    frame = pd.DataFrame(
+        [(score, n, mean, std) for score, (n, mean, std) in means.items()],
+        columns=["Score", "Students", "Mean", "Std"],
+    ).set_index("Score").reindex(list(db.SCORE_COLUMNS[test_type])).dropna(how="all")
+    column.markdown(f"**{test_type.upper()}**")
+    column.bar_chart(frame["Mean"])
+    column.dataframe(frame.round(2), use_container_width=True)
+
+# -------------------- HISTOGRAMS --------------------
+st.subheader("Score distributions")
+test_type = st.radio("Test", list(db.SCORE_COLUMNS), format_func=str.upper, horizontal=True)
+histograms = summary["histograms"].get(test_type, {})
+if histograms:
+    frame = pd.DataFrame(
+        [(score, bucket, n) for score, buckets in histograms.items() for bucket, n in buckets],
+        columns=["Score", "Bucket", "Students"],
+    )
+    fig = px.bar(frame, x="Bucket", y="Students", facet_col="Score", facet_col_wrap=4,
+                 category_orders={"Score": list(db.SCORE_COLUMNS[test_type])})
+    fig.update_xaxes(dtick=db.HISTOGRAM_WIDTH[test_type] * 2)
+    st.plotly_chart(fig, use_container_width=True)
+else:
+    st.caption(f"No {test_type.upper()} results.")
+
+# -------------------- TOP-3 CODES --------------------
+st.subheader("Most common RIASEC codes")
+if summary["top3"]:
+    top3 = pd.DataFrame(summary["top3"], columns=["Code", "Students"])
+    top3["Share"] = (top3["Students"] / top3["Students"].sum()).map("{:.1%}".format)
+    st.dataframe(top3.head(20), use_container_width=True, hide_index=True)
+else:
+    st.caption("No RIASEC results.")
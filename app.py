@@ -1,18 +1,24 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import json
+import os
 import OCR
-import LLM
+import db
+import question_bank
+import quiz_form
+import scoring
+
+# Importing OCR is cheap; the model loads on the first marksheet. Operators who
+# prefer to pay that cost at startup can set SKILLBOT_OCR_WARMUP=1.
+if os.environ.get("SKILLBOT_OCR_WARMUP") == "1":
+    OCR.warm_up()
 # -------------------- PAGE SETUP --------------------
 st.set_page_config(page_title="SkillBot Career & Personality Profiler", layout="centered")
 
 # -------------------- LOAD DATA --------------------
 try:
-    questions = pd.read_csv("questions.csv")
-    careers = pd.read_csv("careers.csv")
-    tci_questions = pd.read_csv("tci_questions.csv")
-except FileNotFoundError as e:
+    # Parsed once per process and shared across reruns (see question_bank.py)
+    questions, careers, tci_questions = question_bank.load_all()
+except (FileNotFoundError, ValueError) as e:
     st.error(f"Error loading data file: {e}. Make sure 'questions.csv', 'careers.csv', and 'tci_questions.csv' are in the correct directory.")
     st.stop()
 
@@ -20,10 +26,10 @@ except FileNotFoundError as e:
 defaults = {
     "page": "intro",  # RIASEC internal page flow
     "index": 0,       # RIASEC question index
-    "answers": [],    # RIASEC answers
+    "answers": scoring.blank_answers(questions),    # RIASEC answers
     "tci_page": "intro",  # TCI internal page flow
     "tci_index": 0,       # TCI question index
-    "tci_answers": [],    # TCI answers
+    "tci_answers": scoring.blank_answers(tci_questions),    # TCI answers
     "riasec_scores": None,
     "tci_scores": None,
     "sidebar_choice": "Home",  # current section
@@ -40,7 +46,7 @@ def restart_all():
 
 # -------------------- FLOW HELPERS --------------------
 def next_question(selected):
-    st.session_state.answers.append(selected)
+    st.session_state.answers[st.session_state.index] = scoring.RIASEC_RATINGS[selected]
     st.session_state.index += 1
     if st.session_state.index >= len(questions):
         st.session_state.page = "riasec_results"
@@ -48,7 +54,7 @@ def next_question(selected):
 
 
 def next_tci(selected):
-    st.session_state.tci_answers.append(selected)
+    st.session_state.tci_answers[st.session_state.tci_index] = scoring.TCI_RATINGS[selected]
     st.session_state.tci_index += 1
     if st.session_state.tci_index >= len(tci_questions):
         st.session_state.tci_page = "tci_results"
@@ -97,7 +103,7 @@ if choice == "Home":
     if st.button("Start Now ➡️"):
         st.session_state.page = "quiz"
         st.session_state.index = 0
-        st.session_state.answers = []
+        st.session_state.answers = scoring.blank_answers(questions)
         st.session_state.sidebar_choice = "RIASEC Test"
         st.rerun()
 
@@ -111,15 +117,17 @@ elif choice == "RIASEC Test":
         if st.button("Start RIASEC Test"):
             st.session_state.page = "quiz"
             st.session_state.index = 0
-            st.session_state.answers = []
+            st.session_state.answers = scoring.blank_answers(questions)
             st.rerun()
 
     elif st.session_state.page == "quiz":
-        if st.session_state.index < len(questions):
+        if quiz_form.FORM_MODE:
+            quiz_form.riasec_form(questions)
+        elif st.session_state.index < len(questions):
             q_idx = st.session_state.index
-            q = questions.iloc[q_idx]
+            q = questions.text[q_idx]
             st.markdown(f"### Question {q_idx + 1} of {len(questions)}")
-            st.markdown(f"**{q['question']}**")
+            st.markdown(f"**{q}**")
             options = {
                 "Strongly Disagree": "😠",
                 "Disagree": "🙁",
@@ -137,15 +145,11 @@ elif choice == "RIASEC Test":
 
     elif st.session_state.page == "riasec_results":
         st.title("Your RIASEC Profile")
-        if not st.session_state.answers:
+        if not scoring.answered(st.session_state.answers):
             st.warning("Please complete the RIASEC test first.")
         else:
-            df = questions.copy()
-            df["answer"] = st.session_state.answers
-            rating_map = {"Strongly Disagree": 1, "Disagree": 2, "Neutral": 3, "Agree": 4, "Strongly Agree": 5}
-            df["score"] = df["answer"].map(rating_map)
-            riasec_scores = df.groupby("category")["score"].mean().sort_values(ascending=False)
-            st.session_state.riasec_scores = riasec_scores
+            riasec_scores = scoring.riasec_scores(questions, st.session_state.answers).sort_values(ascending=False)
+            st.session_state.riasec_scores = scoring.pack_scores(questions, riasec_scores)
 
             st.bar_chart(riasec_scores)
             top = riasec_scores.head(3).index.tolist()
@@ -166,15 +170,17 @@ elif choice == "TCI Test":
         if st.button("Start TCI Test"):
             st.session_state.tci_page = "quiz"
             st.session_state.tci_index = 0
-            st.session_state.tci_answers = []
+            st.session_state.tci_answers = scoring.blank_answers(tci_questions)
             st.rerun()
 
     elif st.session_state.tci_page == "quiz":
-        if st.session_state.tci_index < len(tci_questions):
+        if quiz_form.FORM_MODE:
+            quiz_form.tci_form(tci_questions)
+        elif st.session_state.tci_index < len(tci_questions):
             q_idx = st.session_state.tci_index
-            q = tci_questions.iloc[q_idx]
+            q = tci_questions.text[q_idx]
             st.markdown(f"### Question {q_idx + 1} of {len(tci_questions)}")
-            st.markdown(f"**{q['question']}**")
+            st.markdown(f"**{q}**")
             cols = st.columns(2)
             if cols[0].button("✅ True", key=f"tci_q{q_idx}_true"):
                 next_tci("T")
@@ -186,11 +192,8 @@ elif choice == "TCI Test":
 
     elif st.session_state.tci_page == "tci_results":
         st.title("Your TCI Personality Profile")
-        df = tci_questions.copy()
-        df["answer"] = st.session_state.tci_answers
-        df["score"] = df["answer"].map({"T": 1, "F": 0})
-        tci_scores = df.groupby("trait")["score"].sum()
-        st.session_state.tci_scores = tci_scores
+        tci_scores = scoring.tci_scores(tci_questions, st.session_state.tci_answers)
+        st.session_state.tci_scores = scoring.pack_scores(tci_questions, tci_scores)
 
         fig = px.bar(tci_scores, x=tci_scores.index, y=tci_scores.values,
                      labels={"x": "Trait", "y": "Score"},
@@ -206,8 +209,8 @@ elif choice == "TCI Test":
 # =====================================================
 elif choice == "Dashboard":
     st.title("📊 Combined Career & Personality Dashboard")
-    riasec_scores = st.session_state.get("riasec_scores", None)
-    tci_scores = st.session_state.get("tci_scores", None)
+    riasec_scores = scoring.unpack_riasec(questions, st.session_state.get("riasec_scores"))
+    tci_scores = scoring.unpack_tci(tci_questions, st.session_state.get("tci_scores"))
 
     if riasec_scores is None or tci_scores is None:
         st.warning("⚠️ Please complete both tests first (RIASEC and TCI).")
@@ -259,6 +262,7 @@ elif choice == "Profile Creation (Hidden)":
 
     # Education Info
     education = st.text_input("Current Class/Grade")
+    school = st.text_input("School")
 
     # Upload marksheet
     marksheet = st.file_uploader("Upload Your Marksheet (PDF or Image)", type=["pdf", "png", "jpg", "jpeg"])
@@ -272,10 +276,15 @@ elif choice == "Profile Creation (Hidden)":
                 "age": age,
                 "gender": gender,
                 "education": education,
+                "school": school,
                 "marksheet_filename": marksheet.name
             }
-            with open(f"{name}_profile.json", "w") as f:
-                json.dump(profile_data, f)
+            db.save_profile(name, age, gender, education, school=school.strip() or None,
+                            marksheet_filename=marksheet.name)
+            riasec = scoring.unpack_riasec(questions, st.session_state.riasec_scores)
+            tci = scoring.unpack_tci(tci_questions, st.session_state.tci_scores)
+            db.save_test_results(name, riasec.to_dict() if riasec is not None else None,
+                                 tci.to_dict() if tci is not None else None)
 
             st.success("Profile created successfully!")
             st.json(profile_data)
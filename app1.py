@@ -2,14 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import auth
-import os
+import responses
 
 
 # -------------------- PAGE SETUP --------------------
 st.set_page_config(page_title="SkillBot Interest Profiler", layout="centered")
-# -------------------- RESPONSES FILE SETUP --------------------
-RESPONSES_FILE = "responses/responses.xlsx"
-os.makedirs("responses", exist_ok=True)
+# -------------------- RESPONSES STORE --------------------
+# Responses are appended to skillbot.db (see responses.py); staff can
+# export the old responses/responses.xlsx workbook with `python responses.py export`.
 # -------------------- SESSION --------------------
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -37,6 +37,7 @@ with col2:
             st.session_state.answers = []
             st.session_state.index = 0
             st.session_state.page = "home"
+            st.session_state.responses_saved = False
             st.stop()
 
 if st.session_state.get("show_register", False):
@@ -98,6 +99,7 @@ def restart():
     st.session_state.page = "intro"
     st.session_state.index = 0
     st.session_state.answers = []
+    st.session_state.responses_saved = False
 
 def next_question(selected):
     st.session_state.answers.append(selected)
@@ -110,14 +112,7 @@ def save_responses():
     df["username"] = st.session_state.get("username")
     df["email"] = st.session_state.get("email")
 
-    # Save to Excel
-    if os.path.exists(RESPONSES_FILE):
-        existing = pd.read_excel(RESPONSES_FILE)
-        df_to_save = pd.concat([existing, df], ignore_index=True)
-    else:
-        df_to_save = df
-
-    df_to_save.to_excel(RESPONSES_FILE, index=False)
+    responses.append(df)
     st.success("Your responses have been saved successfully!")
 
 
@@ -146,6 +141,7 @@ if st.session_state.page == "intro":
     """)
     if st.button(" Start the Profiler"):
         st.session_state.page = "quiz"
+        st.session_state.responses_saved = False  # a new test gets saved again
 
 # -------------------- QUIZ PAGE --------------------
 elif st.session_state.page == "quiz":
@@ -187,7 +183,10 @@ elif st.session_state.page == "results":
 
     riasec_scores = df.groupby("category")["score"].mean().sort_values(ascending=False)
     top = riasec_scores.head(3).index.tolist()
-    save_responses()
+    # The results page reruns on every click; store each finished test once
+    if not st.session_state.get("responses_saved"):
+        save_responses()
+        st.session_state.responses_saved = True
 
     st.subheader(" What is RIASEC?")
     st.write("RIASEC stands for **Realistic, Investigative, Artistic, Social, Enterprising, Conventional** — six types of work interests defined by psychologist John Holland.")
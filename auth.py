@@ -1,26 +1,172 @@
 import streamlit as st
-import pandas as pd
+import base64
+import binascii
+import hashlib
+import hmac
 import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+DB_PATH = "skillbot.db"
+USER_FILE = "users.csv"  # legacy plain-text store, migrated into DB_PATH on first use
+
+# ------------------------------------------------------------
+# User store: `users` table in skillbot.db
+#
+# email is the primary key, so lookups are an index probe and two
+# concurrent signups for the same address can't both win: the second
+# INSERT fails on the key. Email addresses are stored lower-cased; other
+# identifiers (faiq.py usernames) keep their case, as in users.csv.
+# Passwords are kept as salted PBKDF2-SHA256 hashes:
+#
+#   pbkdf2_sha256$<iterations>$<salt>$<hash>
+#
+# SKILLBOT_PASSWORD_ITERATIONS tunes the work factor; hashes made with a
+# different count are upgraded on the next successful login.
+# SKILLBOT_HASH_CONCURRENCY caps how many hashes run at once per process,
+# so a burst of logins queues up instead of saturating every core.
+# ------------------------------------------------------------
+PASSWORD_ITERATIONS = int(os.environ.get("SKILLBOT_PASSWORD_ITERATIONS", 200_000))
+HASH_CONCURRENCY = int(os.environ.get("SKILLBOT_HASH_CONCURRENCY", 2))
+_hash_slots = threading.BoundedSemaphore(HASH_CONCURRENCY)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 
-USER_FILE = "users.csv"
+def normalize_email(email):
+    email = str(email or "").strip()
+    return email.lower() if "@" in email else email
+
+
+def hash_password(password, iterations=None, salt=None):
+    iterations = iterations or PASSWORD_ITERATIONS
+    salt = salt or os.urandom(16)
+    with _hash_slots:
+        digest = hashlib.pbkdf2_hmac("sha256", str(password).encode("utf-8"), salt, iterations)
+    return "pbkdf2_sha256${}${}${}".format(
+        iterations, base64.b64encode(salt).decode("ascii"), base64.b64encode(digest).decode("ascii"))
+
+
+def verify_password(password, stored):
+    # A malformed stored hash is a failed login, not a crash
+    try:
+        scheme, iterations, salt, digest = str(stored).split("$")
+        if scheme != "pbkdf2_sha256":
+            return False
+        candidate = hash_password(password, int(iterations), base64.b64decode(salt, validate=True))
+    except (ValueError, binascii.Error, OverflowError):
+        return False
+    return hmac.compare_digest(candidate.rsplit("$", 1)[1], digest)
+
+
+_dummy_hash = None
+
+def _verify_unknown(password):
+    # Unknown accounts still pay for one hash, so response time doesn't
+    # reveal which emails are registered
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("")
+    verify_password(password, _dummy_hash)
+    return False
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def migrate_csv(csv_path=USER_FILE, db_path=DB_PATH):
+    """Import users.csv (plain-text passwords; the email column is headed "username"); returns rows added."""
+    if not os.path.exists(csv_path):
+        return 0
+    users = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    email_col = "email" if "email" in users.columns else users.columns[0]
+    rows = []
+    for email, password in zip(users[email_col], users["password"]):
+        email = normalize_email(email)
+        if email and password:
+            rows.append((email, hash_password(password)))
+    conn = connect(db_path)
+    try:
+        with conn:
+            cur = conn.executemany("INSERT OR IGNORE INTO users (email, password_hash) VALUES (?, ?)", rows)
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+def _ensure_migrated(db_path=DB_PATH):
+    # One-time import the first time the store is used while it's still empty
+    global _migrated
+    if _migrated:
+        return
+    with _migrate_lock:
+        if _migrated:
+            return
+        conn = connect(db_path)
+        try:
+            empty = conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+        finally:
+            conn.close()
+        if empty:
+            migrate_csv(USER_FILE, db_path)
+        _migrated = True
 
-# create user file if it doesn't exist
-if not os.path.exists(USER_FILE):
-    pd.DataFrame(columns=["email", "password"]).to_csv(USER_FILE, index=False)
 
 def signup(email, password):
-    users = pd.read_csv(USER_FILE)
-    if email in users["email"].values:
+    _ensure_migrated()
+    email = normalize_email(email)
+    if not email or not password:
         return False
-    pd.DataFrame({"email": [email], "password": [password]}).to_csv(USER_FILE, mode="a", header=False, index=False)
-    return True
+    password_hash = hash_password(password)  # outside the transaction
+    conn = connect()
+    try:
+        with conn:
+            conn.execute("INSERT INTO users (email, password_hash) VALUES (?, ?)", (email, password_hash))
+        return True
+    except sqlite3.IntegrityError:
+        return False  # email already exists
+    finally:
+        conn.close()
 
 def login(email, password):
-    users = pd.read_csv(USER_FILE)
-    if email in users["email"].values:
-        stored_pw = users.loc[users["email"] == email, "password"].values[0]
-        if stored_pw == password:
-            st.session_state["logged_in"] = True
-            st.session_state["email"] = email
-            return True
-    return False
+    _ensure_migrated()
+    email = normalize_email(email)
+    conn = connect()
+    try:
+        row = conn.execute("SELECT email, password_hash FROM users WHERE email = ?", (email,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return _verify_unknown(password)
+    email, stored = row
+    if not verify_password(password, stored):
+        return False
+    if int(stored.split("$")[1]) != PASSWORD_ITERATIONS:
+        # Hash before opening the write so the slow PBKDF2 never holds the
+        # lock, and only replace the hash that was just verified.
+        upgraded = hash_password(password)
+        conn = connect()
+        try:
+            with conn:
+                conn.execute("UPDATE users SET password_hash = ? WHERE email = ? AND password_hash = ?",
+                             (upgraded, email, stored))
+        finally:
+            conn.close()
+    st.session_state["logged_in"] = True
+    st.session_state["email"] = email
+    return True
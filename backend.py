@@ -0,0 +1,273 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# ------------------------------------------------------------
+# Shared Supabase access for the pages, the OCR worker and the outbox
+#
+# One client per process (Streamlit re-executes page scripts on every
+# rerun, so a module-level create_client in a page made a new client and
+# new HTTP connections each time). Configuration comes from the
+# environment or a .env file:
+#
+#   SUPABASE_URL, SUPABASE_KEY                required
+#   SKILLBOT_SUPABASE_TIMEOUT=10              seconds per request
+#   SKILLBOT_SUPABASE_MAX_CONCURRENCY=8       in-flight requests per process
+#   SKILLBOT_SUPABASE_MAX_CONNECTIONS=20      pooled HTTP connections
+#   SKILLBOT_SUPABASE_KEEPALIVE=30            idle keep-alive seconds
+#
+# Every request made through client(), sign_up/sign_in and the storage
+# helpers is timed and counted; metrics() and health() report on them
+# (python backend.py prints both).
+# ------------------------------------------------------------
+def _env_number(name, default, cast=float):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+def load_config():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    return {
+        "url": os.environ.get("SUPABASE_URL"),
+        "key": os.environ.get("SUPABASE_KEY"),
+        "timeout": _env_number("SKILLBOT_SUPABASE_TIMEOUT", 10.0),
+        "max_concurrency": _env_number("SKILLBOT_SUPABASE_MAX_CONCURRENCY", 8, int),
+        "max_connections": _env_number("SKILLBOT_SUPABASE_MAX_CONNECTIONS", 20, int),
+        "keepalive": _env_number("SKILLBOT_SUPABASE_KEEPALIVE", 30.0),
+    }
+
+
+class NotConfigured(RuntimeError):
+    pass
+
+
+# ---------------- metrics ----------------
+class Metrics:
+    """Per-operation request counts, errors and recent latencies."""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._window = window
+        self.in_flight = 0
+
+    def record(self, op, seconds, error=None):
+        with self._lock:
+            m = self._ops.setdefault(op, {"count": 0, "errors": 0, "last_error": None,
+                                          "latencies": deque(maxlen=self._window)})
+            m["count"] += 1
+            m["latencies"].append(seconds)
+            if error is not None:
+                m["errors"] += 1
+                m["last_error"] = f"{type(error).__name__}: {error}"
+
+    def snapshot(self):
+        with self._lock:
+            out = {"in_flight": self.in_flight, "ops": {}}
+            for op, m in self._ops.items():
+                lat = sorted(m["latencies"])
+                out["ops"][op] = {
+                    "count": m["count"],
+                    "errors": m["errors"],
+                    "last_error": m["last_error"],
+                    "p50_ms": round(lat[len(lat) // 2] * 1000, 1) if lat else None,
+                    "p95_ms": round(lat[int(len(lat) * 0.95)] * 1000, 1) if lat else None,
+                }
+            return out
+
+
+_metrics = Metrics()
+_config = None
+_client = None
+_limiter = None
+_lock = threading.Lock()
+
+
+def _setup():
+    global _config, _limiter
+    if _config is None:
+        _config = load_config()
+        _limiter = threading.BoundedSemaphore(_config["max_concurrency"])
+    return _config
+
+
+def configured():
+    config = _setup()
+    return bool(config["url"] and config["key"])
+
+
+def call(op, fn, *args, **kwargs):
+    """Run one backend request under the concurrency limit and record its latency."""
+    _setup()
+    with _limiter:
+        with _metrics._lock:
+            _metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            _metrics.record(op, time.perf_counter() - start, e)
+            raise
+        else:
+            _metrics.record(op, time.perf_counter() - start)
+            return result
+        finally:
+            with _metrics._lock:
+                _metrics.in_flight -= 1
+
+
+# ---------------- client ----------------
+def _http_client(config):
+    # Newer supabase-py accepts a caller-owned httpx client, which is
+    # where connection pooling and keep-alive are tuned.
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx.Client(
+        timeout=config["timeout"],
+        limits=httpx.Limits(max_connections=config["max_connections"],
+                            max_keepalive_connections=config["max_connections"],
+                            keepalive_expiry=config["keepalive"]),
+    )
+
+
+def _options(config, http=None, **extra):
+    from supabase import ClientOptions
+    options = dict(postgrest_client_timeout=config["timeout"],
+                   storage_client_timeout=int(config["timeout"]), **extra)
+    if http is not None:
+        try:
+            return ClientOptions(httpx_client=http, **options)
+        except TypeError:
+            pass  # older supabase-py builds its own
+    return ClientOptions(**options)
+
+
+def _create(config, http=None, **extra):
+    from supabase import create_client
+    return create_client(config["url"], config["key"], options=_options(config, http, **extra))
+
+
+class _Metered:
+    # Wraps a supabase-py query builder so that execute() goes through call()
+    def __init__(self, target, op):
+        self._target = target
+        self._op = op
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if name == "execute":
+            return lambda: call(self._op, value)
+        if not callable(value):
+            return value
+
+        def chained(*args, **kwargs):
+            result = value(*args, **kwargs)
+            op = self._op if "." in self._op else f"{self._op}.{name}"
+            return _Metered(result, op)
+        return chained
+
+
+class Client:
+    """The process-wide client; table(...) builders are metered and rate-limited."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def table(self, name):
+        return _Metered(self.raw.table(name), name)
+
+    @property
+    def storage(self):
+        return self.raw.storage
+
+
+def client():
+    """Shared Client, or None when SUPABASE_URL / SUPABASE_KEY are not set."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                if not configured():
+                    return None
+                _client = Client(_create(_config, _http_client(_config)))
+    return _client
+
+
+def require_client():
+    c = client()
+    if c is None:
+        raise NotConfigured("Set SUPABASE_URL and SUPABASE_KEY (environment or .env)")
+    return c
+
+
+# ---------------- auth ----------------
+# Sign-in stores the user's session on the client it ran on. Doing that on
+# the shared client would make every other session's requests run as that
+# user, so each auth call gets its own session-less client - all of them on
+# one shared, pooled HTTP client so no connections are left behind.
+_auth_http = None
+
+
+def _auth_client():
+    global _auth_http
+    if not configured():
+        raise NotConfigured("Set SUPABASE_URL and SUPABASE_KEY (environment or .env)")
+    if _auth_http is None:
+        with _lock:
+            if _auth_http is None:
+                _auth_http = _http_client(_config)
+    return _create(_config, _auth_http, auto_refresh_token=False, persist_session=False)
+
+
+def sign_up(email, password):
+    return call("auth.sign_up", _auth_client().auth.sign_up, {"email": email, "password": password})
+
+
+def sign_in(email, password):
+    return call("auth.sign_in", _auth_client().auth.sign_in_with_password,
+                {"email": email, "password": password})
+
+
+# ---------------- storage ----------------
+def upload(bucket, path, data, upsert=False):
+    options = {"upsert": "true"} if upsert else None
+    return call("storage.upload", require_client().storage.from_(bucket).upload, path, data, options)
+
+
+def public_url(bucket, path):
+    return require_client().storage.from_(bucket).get_public_url(path)
+
+
+# ---------------- health ----------------
+def metrics():
+    return _metrics.snapshot()
+
+
+def health(table="profiles"):
+    """Probe the backend with a one-row select; returns status and latency."""
+    if not configured():
+        return {"ok": False, "configured": False, "latency_ms": None, "error": "not configured"}
+    start = time.perf_counter()
+    try:
+        require_client().table(table).select("*").limit(1).execute()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    else:
+        error = None
+    return {"ok": error is None, "configured": True,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1), "error": error}
+
+
+if __name__ == "__main__":
+    import json
+    status = health()
+    print(json.dumps({"health": status, "metrics": metrics()}, indent=2))
+    sys.exit(0 if status["ok"] else 1)
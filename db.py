@@ -0,0 +1,556 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "skillbot.db"
+
+# ------------------------------------------------------------
+# Data access for the profiles / results tables in skillbot.db
+#
+#   with db.connection() as conn: ...      # pooled connection, one transaction
+#   with db.connection(write=True) as conn: ...   # same, holding the write lock
+#   db.save_profile(...), db.save_result(...), db.history(...)
+#
+# Connections come from a small per-process pool (opening one costs
+# a file open plus the PRAGMAs below, on every Streamlit rerun otherwise).
+# All SQL is fixed text with ? parameters, so sqlite3's per-connection
+# statement cache reuses the prepared statements. WAL lets dashboards read
+# while pages and workers write.
+# ------------------------------------------------------------
+POOL_SIZE = 4
+
+# The tables predate this module; _migrate() adds the typed score columns,
+# student ids and the aggregate tables below.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    age INTEGER,
+    gender TEXT,
+    education TEXT,
+    school TEXT,
+    marksheet_filename TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_name TEXT,
+    test_type TEXT,
+    result_data TEXT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles (name);
+CREATE INDEX IF NOT EXISTS idx_results_user_name ON results (user_name, test_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_test_type ON results (test_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp);
+"""
+
+# Typed score columns, named like response.csv / the Supabase test_results table
+RIASEC_COLUMNS = {code: f"riasec_{code}" for code in "RIASEC"}
+TCI_COLUMNS = {trait: "tci_" + trait.replace(" ", "").replace("-", "") for trait in [
+    "Persistence", "Harm Avoidance", "Cooperativeness", "Novelty Seeking",
+    "Reward Dependence", "Self-Directedness", "Self-Transcendence"]}
+SCORE_COLUMNS = {"riasec": RIASEC_COLUMNS, "tci": TCI_COLUMNS}
+ALL_SCORE_COLUMNS = list(RIASEC_COLUMNS.values()) + list(TCI_COLUMNS.values())
+COHORT_COLUMNS = ("school", "education", "gender", "age")
+
+# Students are identified by students.id, assigned once per name, rather
+# than by matching the free-text name across profiles and results.
+STUDENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_student ON profiles (student_id, id);
+CREATE INDEX IF NOT EXISTS idx_results_student ON results (student_id, test_type, id);
+"""
+
+SCHEMA_VERSION = 1
+
+
+def _execute_script(conn, script):
+    # Not executescript: that would COMMIT mid-migration
+    for statement in script.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _migrate(conn):
+    """Bring an existing skillbot.db up to SCHEMA_VERSION (tracked in PRAGMA user_version)."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]  # another process may have won
+        if version < 1:
+            # Typed score columns instead of parsing result_data JSON
+            for column in ALL_SCORE_COLUMNS:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {column} REAL")
+            for test_type, columns in SCORE_COLUMNS.items():
+                sets = ", ".join(f"{col} = json_extract(result_data, '$.\"{key}\"')" for key, col in columns.items())
+                conn.execute(f"UPDATE results SET {sets} WHERE test_type = ? AND json_valid(result_data)", (test_type,))
+
+            # Student ids for every name seen so far
+            conn.execute("ALTER TABLE profiles ADD COLUMN student_id INTEGER")
+            conn.execute("ALTER TABLE results ADD COLUMN student_id INTEGER")
+            _execute_script(conn, STUDENTS_SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO students (name) SELECT name FROM profiles "
+                         "WHERE name IS NOT NULL ORDER BY id")
+            conn.execute("INSERT OR IGNORE INTO students (name) SELECT user_name FROM results "
+                         "WHERE user_name IS NOT NULL ORDER BY id")
+            conn.execute("UPDATE profiles SET student_id = (SELECT id FROM students WHERE name = profiles.name)")
+            conn.execute("UPDATE results SET student_id = (SELECT id FROM students WHERE name = results.user_name)")
+            for test_type, columns in SCORE_COLUMNS.items():
+                # Covering: cohort averages are answered from the index alone
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_results_{test_type}_scores "
+                             f"ON results (test_type, student_id, {', '.join(columns.values())})")
+
+            # Aggregate tables for the analytics page
+            _execute_script(conn, AGGREGATE_SCHEMA)
+            _rebuild_aggregates(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+INSERT_STUDENT = "INSERT INTO students (name) VALUES (?) ON CONFLICT (name) DO NOTHING"
+SELECT_STUDENT = "SELECT id FROM students WHERE name = ?"
+INSERT_PROFILE = (
+    "INSERT INTO profiles (student_id, name, age, gender, education, school, marksheet_filename) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_RESULT = {
+    test_type: f"INSERT INTO results (student_id, user_name, test_type, {', '.join(columns.values())}) "
+               f"VALUES (?, ?, ?, {', '.join('?' * len(columns))})"
+    for test_type, columns in SCORE_COLUMNS.items()
+}
+SELECT_LATEST_PROFILE = "SELECT * FROM profiles WHERE name = ? ORDER BY id DESC LIMIT 1"
+SELECT_STUDENT_PROFILE = "SELECT * FROM profiles WHERE student_id = ? ORDER BY id DESC LIMIT 1"
+_RESULT_FIELDS = f"id, user_name, test_type, result_data, timestamp, {', '.join(ALL_SCORE_COLUMNS)}"
+SELECT_HISTORY = (
+    f"SELECT {_RESULT_FIELDS} FROM results "
+    "WHERE user_name = ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+SELECT_HISTORY_BY_TYPE = (
+    f"SELECT {_RESULT_FIELDS} FROM results "
+    "WHERE user_name = ? AND test_type = ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+SELECT_RECENT = (
+    f"SELECT {_RESULT_FIELDS} FROM results "
+    "WHERE test_type = ? AND timestamp >= ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+
+
+def _open(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None,
+                           check_same_thread=False, cached_statements=128)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable across app crashes; WAL keeps it consistent
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, db_path=DB_PATH, size=POOL_SIZE):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(size)
+        conn = _open(db_path)
+        try:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def connection(self, write=False):
+        """
+        A pooled connection; the block runs in one transaction (rolled back on error).
+        write=True starts it with BEGIN IMMEDIATE: a deferred transaction that
+        reads and then writes fails with SQLITE_BUSY if another connection
+        committed in between, instead of waiting for the lock.
+        """
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = _open(self.db_path)
+            healthy = True
+            try:
+                conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                healthy = False
+                raise
+            finally:
+                if healthy and not conn.in_transaction:
+                    self._idle.put_nowait(conn)
+                else:
+                    conn.close()  # don't hand a broken connection to the next caller
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def pool(db_path=DB_PATH):
+    if db_path not in _pools:
+        with _pools_lock:
+            if db_path not in _pools:
+                _pools[db_path] = ConnectionPool(db_path)
+    return _pools[db_path]
+
+
+def connection(db_path=DB_PATH, write=False):
+    return pool(db_path).connection(write)
+
+
+def _result(row):
+    # result_data is rebuilt from the typed columns ({"R": 3.5, ...}); the
+    # JSON column itself is only kept for rows written before v1.
+    result = {k: row[k] for k in ("id", "user_name", "test_type", "timestamp")}
+    columns = SCORE_COLUMNS.get(row["test_type"], {})
+    result["result_data"] = {key: row[col] for key, col in columns.items()}
+    return result
+
+
+def _student_id(conn, name):
+    conn.execute(INSERT_STUDENT, (name,))
+    return conn.execute(SELECT_STUDENT, (name,)).fetchone()[0]
+
+
+# ---------------- profiles ----------------
+def save_profile(name, age=None, gender=None, education=None, school=None,
+                 marksheet_filename=None, db_path=DB_PATH):
+    with connection(db_path, write=True) as conn:
+        student_id = _student_id(conn, name)
+        previous = conn.execute(SELECT_STUDENT_PROFILE, (student_id,)).fetchone()
+        cur = conn.execute(INSERT_PROFILE, (student_id, name, age, gender, education, school, marksheet_filename))
+        _move_student(conn, student_id, previous, {"school": school, "education": education})
+        return cur.lastrowid
+
+
+def get_profile(name, db_path=DB_PATH):
+    with connection(db_path) as conn:
+        row = conn.execute(SELECT_LATEST_PROFILE, (name,)).fetchone()
+    return dict(row) if row else None
+
+
+# ---------------- results ----------------
+def _insert_result(conn, user_name, test_type, scores):
+    if test_type not in SCORE_COLUMNS:
+        raise ValueError(f"unknown test type {test_type!r}")
+    values = [scores.get(key) for key in SCORE_COLUMNS[test_type]]
+    student_id = _student_id(conn, user_name)
+    # Same transaction, so the aggregates never disagree with results
+    _aggregate_result(conn, student_id, test_type, dict(zip(SCORE_COLUMNS[test_type], values)))
+    return conn.execute(INSERT_RESULT[test_type], (student_id, user_name, test_type, *values)).lastrowid
+
+
+def save_result(user_name, test_type, result_data, db_path=DB_PATH):
+    """result_data: dict of scores keyed like the score Series ({"R": 3.4, ...} / {"Persistence": 2, ...})."""
+    with connection(db_path, write=True) as conn:
+        return _insert_result(conn, user_name, test_type, result_data)
+
+
+def save_test_results(user_name, riasec=None, tci=None, db_path=DB_PATH):
+    """Store a user's RIASEC / TCI score dicts (either may be None) in one transaction."""
+    with connection(db_path, write=True) as conn:
+        for test_type, scores in (("riasec", riasec), ("tci", tci)):
+            if scores is not None:
+                _insert_result(conn, user_name, test_type, scores)
+
+
+def history(user_name, test_type=None, limit=50, db_path=DB_PATH):
+    """A user's results, newest first."""
+    with connection(db_path) as conn:
+        if test_type is None:
+            rows = conn.execute(SELECT_HISTORY, (user_name, limit)).fetchall()
+        else:
+            rows = conn.execute(SELECT_HISTORY_BY_TYPE, (user_name, test_type, limit)).fetchall()
+    return [_result(r) for r in rows]
+
+
+def recent_results(test_type, since="1970-01-01", limit=1000, db_path=DB_PATH):
+    """All users' results of one test since a timestamp ('YYYY-MM-DD[ HH:MM:SS]'), newest first."""
+    with connection(db_path) as conn:
+        rows = conn.execute(SELECT_RECENT, (test_type, since, limit)).fetchall()
+    return [_result(r) for r in rows]
+
+
+def cohort_means(test_type, by="school", db_path=DB_PATH):
+    """
+    Average scores per profile attribute, computed in SQLite, e.g.
+    cohort_means("riasec", "school") -> [{"school": ..., "n": ..., "riasec_R": ..., ...}, ...]
+    Each user counts with their latest profile.
+    """
+    if test_type not in SCORE_COLUMNS:
+        raise ValueError(f"unknown test type {test_type!r}")
+    if by not in COHORT_COLUMNS:
+        raise ValueError(f"can't group by {by!r}; use one of {COHORT_COLUMNS}")
+    columns = list(SCORE_COLUMNS[test_type].values())
+    sql = (
+        f"SELECT p.{by} AS {by}, COUNT(*) AS n, "
+        + ", ".join(f"AVG(r.{c}) AS {c}" for c in columns)
+        + " FROM results r"
+        " JOIN (SELECT student_id, MAX(id) AS id FROM profiles GROUP BY student_id) latest"
+        " ON latest.student_id = r.student_id"
+        " JOIN profiles p ON p.id = latest.id"
+        f" WHERE r.test_type = ? GROUP BY p.{by} ORDER BY p.{by}"
+    )
+    with connection(db_path) as conn:
+        return [dict(r) for r in conn.execute(sql, (test_type,)).fetchall()]
+
+
+# ------------------------------------------------------------
+# Pre-aggregated cohort statistics (the analytics page reads only these)
+#
+#   agg_students   students with at least one result
+#   agg_scores     n / sum / sum of squares per score  -> mean, std
+#   agg_histogram  counts per score bucket
+#   agg_top3       frequency of top-3 RIASEC codes ("IAS", ...)
+#
+# Every row is kept per (scope, cohort): ("all", ""), ("school", <school>)
+# and ("education", <class>). A student (students.id) counts once per test,
+# with their latest result, under their latest profile:
+#
+#   _insert_result  swaps the student's previous result of that test for the new one
+#   save_profile    moves the student's results when school / class change
+#
+# Both update the aggregates inside their BEGIN IMMEDIATE write transaction,
+# reading only that student's rows, so reading a cohort never scans results.
+# ------------------------------------------------------------
+AGGREGATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agg_students (
+    scope TEXT NOT NULL,
+    cohort TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (scope, cohort)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS agg_scores (
+    scope TEXT NOT NULL,
+    cohort TEXT NOT NULL,
+    test_type TEXT NOT NULL,
+    score TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    PRIMARY KEY (scope, cohort, test_type, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS agg_histogram (
+    scope TEXT NOT NULL,
+    cohort TEXT NOT NULL,
+    test_type TEXT NOT NULL,
+    score TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (scope, cohort, test_type, score, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS agg_top3 (
+    scope TEXT NOT NULL,
+    cohort TEXT NOT NULL,
+    code TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (scope, cohort, code)
+) WITHOUT ROWID;
+"""
+AGGREGATE_TABLES = ("agg_students", "agg_scores", "agg_histogram", "agg_top3")
+SCOPES = ("all", "school", "education")
+HISTOGRAM_WIDTH = {"riasec": 0.5, "tci": 1.0}  # RIASEC means are 1-5, TCI scores are counts
+
+UPSERT_AGG_STUDENTS = (
+    "INSERT INTO agg_students (scope, cohort, n) VALUES (?, ?, ?) "
+    "ON CONFLICT (scope, cohort) DO UPDATE SET n = n + excluded.n"
+)
+UPSERT_AGG_SCORE = (
+    "INSERT INTO agg_scores (scope, cohort, test_type, score, n, total, total_sq) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (scope, cohort, test_type, score) DO UPDATE SET "
+    "n = n + excluded.n, total = total + excluded.total, total_sq = total_sq + excluded.total_sq"
+)
+UPSERT_AGG_HISTOGRAM = (
+    "INSERT INTO agg_histogram (scope, cohort, test_type, score, bucket, n) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (scope, cohort, test_type, score, bucket) DO UPDATE SET n = n + excluded.n"
+)
+UPSERT_AGG_TOP3 = (
+    "INSERT INTO agg_top3 (scope, cohort, code, n) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (scope, cohort, code) DO UPDATE SET n = n + excluded.n"
+)
+# Rows whose count dropped to zero are removed so empty cohorts disappear
+DELETE_EMPTY = {
+    "agg_students": "DELETE FROM agg_students WHERE scope = ? AND cohort = ? AND n <= 0",
+    "agg_scores": "DELETE FROM agg_scores WHERE scope = ? AND cohort = ? AND test_type = ? AND score = ? AND n <= 0",
+    "agg_histogram": ("DELETE FROM agg_histogram WHERE scope = ? AND cohort = ? AND test_type = ? "
+                      "AND score = ? AND bucket = ? AND n <= 0"),
+    "agg_top3": "DELETE FROM agg_top3 WHERE scope = ? AND cohort = ? AND code = ? AND n <= 0",
+}
+SELECT_LATEST_RESULT = (
+    f"SELECT {', '.join(ALL_SCORE_COLUMNS)} FROM results "
+    "WHERE student_id = ? AND test_type = ? ORDER BY id DESC LIMIT 1"
+)
+SELECT_HAS_RESULTS = "SELECT 1 FROM results WHERE student_id = ? LIMIT 1"
+
+
+def _cohorts(profile):
+    if profile is None:
+        return [("all", ""), ("school", ""), ("education", "")]
+    return [("all", ""), ("school", str(profile["school"] or "")), ("education", str(profile["education"] or ""))]
+
+
+def top3_code(riasec):
+    """'IAS'-style code from {"R": ..., ...}; ties keep RIASEC order. None if a score is missing."""
+    if any(riasec.get(c) is None for c in RIASEC_COLUMNS):
+        return None
+    return "".join(sorted(RIASEC_COLUMNS, key=lambda c: -riasec[c])[:3])
+
+
+def _scores(row, test_type):
+    return {key: row[col] for key, col in SCORE_COLUMNS[test_type].items()}
+
+
+def _new_deltas():
+    return {table: {} for table in AGGREGATE_TABLES}
+
+
+def _add_student(deltas, cohorts, sign=1):
+    for key in cohorts:
+        deltas["agg_students"][key] = deltas["agg_students"].get(key, 0) + sign
+
+
+def _add_result(deltas, test_type, cohorts, values, sign=1):
+    """Add (sign=1) or remove (sign=-1) one result's contribution to cohorts."""
+    width = HISTOGRAM_WIDTH[test_type]
+    code = top3_code(values) if test_type == "riasec" else None
+    scores, histogram, top3 = deltas["agg_scores"], deltas["agg_histogram"], deltas["agg_top3"]
+    for scope, cohort in cohorts:
+        for key, v in values.items():
+            if v is None:
+                continue
+            acc = scores.setdefault((scope, cohort, test_type, key), [0, 0.0, 0.0])
+            acc[0] += sign
+            acc[1] += sign * v
+            acc[2] += sign * v * v
+            bucket = (scope, cohort, test_type, key, (v // width) * width)
+            histogram[bucket] = histogram.get(bucket, 0) + sign
+        if code is not None:
+            top3[(scope, cohort, code)] = top3.get((scope, cohort, code), 0) + sign
+
+
+def _apply_deltas(conn, deltas):
+    """Summed in Python first: one upsert per touched key, however many results went in."""
+    upserts = {"agg_students": UPSERT_AGG_STUDENTS, "agg_scores": UPSERT_AGG_SCORE,
+               "agg_histogram": UPSERT_AGG_HISTOGRAM, "agg_top3": UPSERT_AGG_TOP3}
+    for table, changes in deltas.items():
+        # agg_scores values are [n, total, total_sq]; the others a bare count
+        changes = {k: v if isinstance(v, list) else [v] for k, v in changes.items()}
+        conn.executemany(upserts[table], [(*k, *v) for k, v in changes.items() if any(v)])
+        emptied = [k for k, v in changes.items() if v[0] < 0]
+        if emptied:
+            conn.executemany(DELETE_EMPTY[table], emptied)
+
+
+def _aggregate_result(conn, student_id, test_type, values):
+    # Called before the new row is inserted: the student's previous result
+    # of this test (if any) is replaced by the new one.
+    cohorts = _cohorts(conn.execute(SELECT_STUDENT_PROFILE, (student_id,)).fetchone())
+    deltas = _new_deltas()
+    previous = conn.execute(SELECT_LATEST_RESULT, (student_id, test_type)).fetchone()
+    if previous is not None:
+        _add_result(deltas, test_type, cohorts, _scores(previous, test_type), -1)
+    elif conn.execute(SELECT_HAS_RESULTS, (student_id,)).fetchone() is None:
+        _add_student(deltas, cohorts)
+    _add_result(deltas, test_type, cohorts, values)
+    _apply_deltas(conn, deltas)
+
+
+def _move_student(conn, student_id, old_profile, new_profile):
+    # Called when a profile is saved: re-file the student's latest results
+    # under the new school / class.
+    old, new = _cohorts(old_profile), _cohorts(new_profile)
+    if old == new or conn.execute(SELECT_HAS_RESULTS, (student_id,)).fetchone() is None:
+        return
+    deltas = _new_deltas()
+    _add_student(deltas, old, -1)
+    _add_student(deltas, new)
+    for test_type in SCORE_COLUMNS:
+        latest = conn.execute(SELECT_LATEST_RESULT, (student_id, test_type)).fetchone()
+        if latest is not None:
+            values = _scores(latest, test_type)
+            _add_result(deltas, test_type, old, values, -1)
+            _add_result(deltas, test_type, new, values)
+    _apply_deltas(conn, deltas)
+
+
+def _rebuild_aggregates(conn, chunk=50_000):
+    """Recompute every aggregate table from results and profiles (migration only)."""
+    for table in AGGREGATE_TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    latest = {}
+    for row in conn.execute("SELECT * FROM profiles WHERE student_id IS NOT NULL ORDER BY id"):
+        latest[row["student_id"]] = row
+    cursor = conn.execute(
+        f"SELECT r.student_id, r.test_type, {', '.join('r.' + c for c in ALL_SCORE_COLUMNS)} FROM results r "
+        "JOIN (SELECT MAX(id) AS id FROM results WHERE student_id IS NOT NULL "
+        "GROUP BY student_id, test_type) l ON l.id = r.id "
+        "ORDER BY r.student_id"
+    )
+    seen = set()
+    while True:
+        rows = cursor.fetchmany(chunk)
+        if not rows:
+            break
+        deltas = _new_deltas()
+        for row in rows:
+            if row["test_type"] not in SCORE_COLUMNS:
+                continue
+            cohorts = _cohorts(latest.get(row["student_id"]))
+            if row["student_id"] not in seen:
+                seen.add(row["student_id"])
+                _add_student(deltas, cohorts)
+            _add_result(deltas, row["test_type"], cohorts, _scores(row, row["test_type"]))
+        _apply_deltas(conn, deltas)
+
+
+def cohorts(scope="school", db_path=DB_PATH):
+    """Cohorts that have results in a scope, with their number of students."""
+    with connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT cohort, n FROM agg_students WHERE scope = ? AND n > 0 ORDER BY cohort", (scope,)
+        ).fetchall()
+    return {r["cohort"]: r["n"] for r in rows}
+
+
+def cohort_summary(scope="all", cohort="", db_path=DB_PATH):
+    """
+    Everything the analytics page shows for one cohort, from the aggregate tables:
+    {"means": {test_type: {score: (n, mean, std)}},
+     "histograms": {test_type: {score: [(bucket, n), ...]}},
+     "top3": [(code, n), ...]}
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"unknown scope {scope!r}; use one of {SCOPES}")
+    summary = {"means": {}, "histograms": {}, "top3": []}
+    with connection(db_path) as conn:
+        for r in conn.execute(
+            "SELECT test_type, score, n, total, total_sq FROM agg_scores WHERE scope = ? AND cohort = ? AND n > 0",
+            (scope, cohort),
+        ):
+            mean = r["total"] / r["n"]
+            std = max(r["total_sq"] / r["n"] - mean * mean, 0.0) ** 0.5
+            summary["means"].setdefault(r["test_type"], {})[r["score"]] = (r["n"], mean, std)
+        for r in conn.execute(
+            "SELECT test_type, score, bucket, n FROM agg_histogram WHERE scope = ? AND cohort = ? AND n > 0 ORDER BY bucket",
+            (scope, cohort),
+        ):
+            summary["histograms"].setdefault(r["test_type"], {}).setdefault(r["score"], []).append((r["bucket"], r["n"]))
+        summary["top3"] = [(r["code"], r["n"]) for r in conn.execute(
+            "SELECT code, n FROM agg_top3 WHERE scope = ? AND cohort = ? AND n > 0 ORDER BY n DESC, code",
+            (scope, cohort),
+        )]
+    return summary
@@ -0,0 +1,158 @@
+import os
+import json
+import sqlite3
+import uuid
+
+DB_PATH = "skillbot.db"
+SPOOL_DIR = "spool"
+
+# ------------------------------------------------------------
+# Marksheet job queue (SQLite table inside skillbot.db)
+#
+# The Streamlit app only spools the uploaded file and inserts a row; the
+# worker in ocr_worker.py claims rows, does the upload / OCR / recommendation
+# and writes the result back. The UI polls get_job() for status.
+#
+#   queued -> running -> done | failed
+# ------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS marksheet_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT,
+    file_path TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_marksheet_jobs_status ON marksheet_jobs (status, id);
+"""
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 30  # seconds before the first retry, doubled on every further attempt
+
+
+def connect(db_path=DB_PATH):
+    # Autocommit mode; claim_next() opens its own write transaction
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # WAL lets the UI keep reading job status while the worker writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row_to_job(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+# ---------------- producer side (Streamlit) ----------------
+def spool_file(user_id, filename, data, spool_dir=SPOOL_DIR):
+    os.makedirs(spool_dir, exist_ok=True)
+    safe_name = os.path.basename(filename)
+    path = os.path.join(spool_dir, f"{user_id}_{uuid.uuid4().hex[:8]}_{safe_name}")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def enqueue(user_id, file_path, payload=None, db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(
+            "INSERT INTO marksheet_jobs (user_id, file_path, payload) VALUES (?, ?, ?)",
+            (user_id, file_path, json.dumps(payload or {})),
+        )
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def enqueue_marksheet(user_id, filename, data, payload=None, db_path=DB_PATH):
+    """Spool an uploaded marksheet and queue it; returns the job id."""
+    payload = dict(payload or {}, filename=os.path.basename(filename))
+    return enqueue(user_id, spool_file(user_id, filename, data), payload, db_path)
+
+
+def get_job(job_id, db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        row = conn.execute("SELECT * FROM marksheet_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row)
+    finally:
+        conn.close()
+
+
+# ---------------- consumer side (worker) ----------------
+def claim_next(conn):
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers can
+    # never claim the same job.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT * FROM marksheet_jobs WHERE status = 'queued' "
+            "AND (not_before IS NULL OR not_before <= datetime('now')) ORDER BY id LIMIT 1"
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE marksheet_jobs SET status = 'running', attempts = attempts + 1, "
+            "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (row["id"],),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    job = _row_to_job(row)
+    job["status"] = "running"
+    job["attempts"] += 1
+    return job
+
+
+def complete(conn, job_id, result):
+    conn.execute(
+        "UPDATE marksheet_jobs SET status = 'done', result = ?, error = NULL, "
+        "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (json.dumps(result), job_id),
+    )
+
+
+def fail(conn, job_id, error, attempts):
+    """Requeue a failed job with a backoff delay, or give up after MAX_ATTEMPTS; returns the new status."""
+    # Transient failures (network, busy DB) go back on the queue a few times
+    status = "queued" if attempts < MAX_ATTEMPTS else "failed"
+    delay = RETRY_DELAY * 2 ** (attempts - 1)
+    conn.execute(
+        "UPDATE marksheet_jobs SET status = ?, error = ?, not_before = datetime('now', ?), "
+        "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (status, str(error), f"+{int(delay)} seconds", job_id),
+    )
+    return status
+
+
+def remove_spool(job):
+    """Delete a finished job's spooled upload."""
+    try:
+        os.remove(job["file_path"])
+    except FileNotFoundError:
+        pass
+
+
+def requeue_stale(conn, older_than_seconds=600):
+    """Put back jobs left 'running' by a worker that died mid-job."""
+    conn.execute(
+        "UPDATE marksheet_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP "
+        "WHERE status = 'running' AND updated_at < datetime('now', ?)",
+        (f"-{int(older_than_seconds)} seconds",),
+    )
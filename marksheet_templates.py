@@ -0,0 +1,159 @@
+import re
+
+import pandas as pd
+
+import OCR
+
+# ------------------------------------------------------------
+# Board / layout templates for marksheet parsing
+#
+# Each template is a declarative spec:
+#   header_anchor   - text that starts the marks table (None = parse from the top)
+#   columns         - order of the numeric columns after a subject name
+#   subjects        - subject vocabulary printed on this board's marksheets
+#   total_label     - label of the grand total row
+#   ranges          - allowed (low, high) value for each column and for the total row
+#   serial_max      - a number <= serial_max sitting between two marks is a
+#                     serial number and is skipped (None = don't skip)
+#   min_subjects    - distinct vocabulary hits needed to pick this template
+#
+# register_template() compiles a spec once into regexes and lookup tables,
+# classify() picks the template for an OCR dump and parse() runs it. Dumps
+# that match no template fall back to the generic OCR.parse_marks heuristic,
+# and so do single rows whose subject is not in the template's vocabulary.
+# ------------------------------------------------------------
+TEMPLATES = {}
+
+def compile_template(name, spec):
+    subjects = sorted({s.upper() for s in spec["subjects"]}, key=len, reverse=True)
+    columns = list(spec.get("columns", ["maximum", "obtained"]))
+    ranges = spec.get("ranges", {})
+    return {
+        "name": name,
+        "header_anchor": (spec.get("header_anchor") or "").upper() or None,
+        "columns": columns,
+        "column_ranges": [ranges.get(c, (0, float("inf"))) for c in columns],
+        "total_label": spec.get("total_label", "TOTAL").upper(),
+        "total_range": ranges.get("total", (0, float("inf"))),
+        "serial_max": spec.get("serial_max"),
+        "min_subjects": spec.get("min_subjects", 3),
+        # Longest names first so "PAKISTAN STUDIES" wins over any shorter overlap;
+        # whole words only, so "EDUCATION" doesn't fire inside "EDUCATIONAL"
+        "subject_re": re.compile(r"\b(?:" + "|".join(re.escape(s) for s in subjects) + r")\b"),
+        # How far past a subject name its marks may be scattered by OCR
+        "window": len(columns) + 3,
+    }
+
+def register_template(name, spec):
+    TEMPLATES[name] = compile_template(name, spec)
+    return TEMPLATES[name]
+
+
+# ------------------------------------------------------------
+# Built-in templates
+# ------------------------------------------------------------
+# Punjab BISE secondary school certificate ("SUBJECT - WISE STATEMENT OF MARKS")
+register_template("bise_ssc", {
+    "header_anchor": OCR.HEADER_ANCHOR,
+    "columns": ["maximum", "obtained"],
+    "subjects": ["URDU", "ENGLISH", "ISLAMIYAT", "ISLAMIAT", "PAKISTAN STUDIES",
+                 "MATHEMATICS", "GENERAL MATHEMATICS", "PHYSICS", "CHEMISTRY",
+                 "BIOLOGY", "COMPUTER SCIENCE", "GENERAL SCIENCE", "EDUCATION"],
+    "total_label": "TOTAL",
+    "ranges": {"maximum": (10, 200), "obtained": (0, 200), "total": (100, 1500)},
+    "serial_max": 9,
+})
+
+
+# ------------------------------------------------------------
+# Classification: pick the template that fits an OCR dump
+# ------------------------------------------------------------
+def classify(text_list):
+    uppers = [str(t).strip().upper() for t in text_list]
+    best, best_score = None, 0
+    for template in TEMPLATES.values():
+        hits = {m.group(0) for u in uppers for m in template["subject_re"].finditer(u)}
+        if len(hits) < template["min_subjects"]:
+            continue
+        score = len(hits)
+        anchor = template["header_anchor"]
+        if anchor and any(anchor in u for u in uppers):
+            score += 10  # the anchor is by far the strongest signal
+        if score > best_score:
+            best, best_score = template, score
+    return best
+
+
+# ------------------------------------------------------------
+# Template parser: one linear pass, numbers assigned by column order
+# ------------------------------------------------------------
+def parse_with_template(template, text_list):
+    texts, kinds, nums, _, _ = OCR.tokenize_marks(text_list)
+    uppers = [t.upper() for t in texts]
+    n = len(texts)
+
+    start = 0
+    anchor = template["header_anchor"]
+    if anchor:
+        start = next((idx + 1 for idx, u in enumerate(uppers) if anchor in u), 0)
+
+    subject_re = template["subject_re"]
+    column_ranges = template["column_ranges"]
+    n_cols = len(column_ranges)
+    serial_max = template["serial_max"]
+    window = template["window"]
+
+    rows = []
+    i = start
+    while i < n:
+        upper = uppers[i]
+        is_total = upper == template["total_label"]
+        known = is_total or subject_re.search(upper) is not None
+        if not known and kinds[i] != OCR.TOKEN_SUBJECT:
+            i += 1
+            continue
+
+        # Collect this row's marks; stop at the next subject so a row with a
+        # missing mark can't steal numbers from the one below it.
+        values = []
+        last = i
+        # Subjects outside the vocabulary (e.g. TARJUMA-TUL-QURAN) get
+        # parse_marks' shorter look-ahead rather than being dropped
+        for j in range(i + 1, min(i + 1 + (window if known else 4), n)):
+            if uppers[j] == template["total_label"] or subject_re.search(uppers[j]):
+                break
+            num = nums[j]
+            if num is None:
+                continue
+            if is_total:
+                low, high = template["total_range"]
+            else:
+                if (serial_max is not None and values and num <= serial_max
+                        and j + 1 < n and nums[j + 1] is not None):
+                    continue
+                low, high = column_ranges[len(values)]
+            if low <= num <= high:
+                values.append(num)
+                last = j
+                if len(values) == n_cols:
+                    break
+
+        if len(values) == n_cols:
+            row = dict(zip(template["columns"], values))
+            if is_total and row.get("maximum", 0) < row.get("obtained", 0):
+                # OCR sometimes reads the total cells out of order
+                row["maximum"], row["obtained"] = row["obtained"], row["maximum"]
+            rows.append((texts[i], int(row.get("maximum", 0)), int(row.get("obtained", 0))))
+            i = last + 1
+        else:
+            i += 1
+
+    return pd.DataFrame(rows, columns=["Subject", "Maximum", "Obtained"])
+
+
+def parse(text_list):
+    """Parse an OCR dump with its board template, or the generic heuristic if none fits."""
+    template = classify(text_list)
+    if template is None:
+        return OCR.parse_marks(text_list)
+    return parse_with_template(template, text_list)
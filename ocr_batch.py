@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import ocr_cache
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp", ".pdf")
+
+# ------------------------------------------------------------
+# 1) Collect marksheet images from a directory or a list
+# ------------------------------------------------------------
+def collect_images(source):
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            return sorted(
+                os.path.join(source, name)
+                for name in os.listdir(source)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        return [source]
+    return [os.fspath(p) for p in source]
+
+
+# ------------------------------------------------------------
+# 2) Worker process: load PaddleOCR once and keep it warm
+# ------------------------------------------------------------
+_cache = None
+
+def _init_worker(threads_per_worker, cache_dir):
+    # Each worker gets its own slice of the CPU; letting every process spawn
+    # one math thread per core oversubscribes the machine and kills scaling.
+    threads = str(threads_per_worker)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = threads
+
+    global OCR, _cache
+    import OCR
+    OCR.warm_up()  # build the PaddleOCR model once for this process
+
+    if cache_dir:
+        _cache = ocr_cache.OCRCache(cache_dir)
+
+
+def _process_image(path):
+    timings = {}
+    start = time.perf_counter()
+    try:
+        df = OCR.extract_marks_from_marksheet(path, cache=_cache, timings=timings,
+                                              verbose=False)
+        error = None
+    except Exception as e:
+        df = None
+        error = f"{type(e).__name__}: {e}"
+
+    timings["total"] = time.perf_counter() - start
+    return {"path": path, "marks": df, "timings": timings, "error": error}
+
+
+# ------------------------------------------------------------
+# 3) Batch API: stream Subject/Maximum/Obtained frames back
+# ------------------------------------------------------------
+def extract_marks_batch(source, workers=None, threads_per_worker=1, max_pending=None,
+                        cache_dir=None):
+    """
+    source: directory of images, a single image path, or a list of paths
+    workers: number of OCR processes (defaults to the CPU count)
+    cache_dir: optional ocr_cache directory shared by all workers
+    Yields one dict per image as soon as it is done:
+        {"path", "marks" (DataFrame or None), "timings" (seconds), "error"}
+    Results arrive in completion order, not input order.
+    """
+    paths = collect_images(source)
+    if not paths:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    # Keep only a few images queued per worker so thousands of uploads
+    # don't pile up as pending futures in the parent process.
+    max_pending = max_pending or workers * 2
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker,
+                             initargs=(threads_per_worker, cache_dir)) as pool:
+        remaining = iter(paths)
+        pending = set()
+
+        for path in remaining:
+            pending.add(pool.submit(_process_image, path))
+            if len(pending) >= max_pending:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.add(pool.submit(_process_image, next_path))
+
+
+def save_batch_results(results, output_dir):
+    """Write each frame to <output_dir>/<image name>.csv and return a timings table."""
+    import pandas as pd
+
+    os.makedirs(output_dir, exist_ok=True)
+    rows = []
+    for res in results:
+        name = os.path.splitext(os.path.basename(res["path"]))[0]
+        if res["marks"] is not None:
+            res["marks"].to_csv(os.path.join(output_dir, f"{name}.csv"), index=False)
+        rows.append({"path": res["path"], "error": res["error"], **res["timings"]})
+    return pd.DataFrame(rows)
+
+
+# ------------------------------------------------------------
+# 4) Run on a folder of marksheets
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else "marksheets"
+    out = sys.argv[2] if len(sys.argv) > 2 else "marksheet_results"
+
+    t0 = time.perf_counter()
+    report = save_batch_results(extract_marks_batch(src), out)
+    elapsed = time.perf_counter() - t0
+
+    print(report)
+    if len(report):
+        print(f"\n⏱️ {len(report)} images in {elapsed:.1f}s ({len(report) / elapsed:.2f} img/s)")
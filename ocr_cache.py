@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+import pandas as pd
+
+CACHE_DIR = "ocr_cache"
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# ------------------------------------------------------------
+# Content-addressed cache for marksheet OCR
+#
+#   <root>/raw/<key>.json                        -> rec_texts list from PaddleOCR
+#   <root>/parsed/<parser_version>/<key>.csv     -> parse_marks() DataFrame
+#
+# Keys start with the SHA-256 of the image bytes (see image_digest).
+#
+# The two layers are stored separately so that changing the parser only
+# invalidates the cheap parsed layer, never the expensive OCR layer.
+# Entries are evicted least-recently-used first once the cache grows past
+# max_bytes (a hit refreshes the file's mtime).
+# ------------------------------------------------------------
+def image_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class OCRCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "raw"), exist_ok=True)
+        os.makedirs(os.path.join(root, "parsed"), exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    # ---------------- paths ----------------
+    def _raw_path(self, key):
+        return os.path.join(self.root, "raw", f"{key}.json")
+
+    def _parsed_path(self, key, parser_version):
+        return os.path.join(self.root, "parsed", str(parser_version), f"{key}.csv")
+
+    # ---------------- raw OCR layer ----------------
+    def get_raw(self, key):
+        path = self._raw_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                texts = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        self._touch(path)
+        return texts
+
+    def put_raw(self, key, texts):
+        self._write(self._raw_path(key), json.dumps(list(texts), ensure_ascii=False))
+
+    # ---------------- parsed layer ----------------
+    def get_parsed(self, key, parser_version):
+        path = self._parsed_path(key, parser_version)
+        try:
+            df = pd.read_csv(path)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return None
+        self._touch(path)
+        return df
+
+    def put_parsed(self, key, parser_version, df):
+        self._write(self._parsed_path(key, parser_version), df.to_csv(index=False))
+
+    # ---------------- housekeeping ----------------
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another process in the meantime
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = text.encode("utf-8")
+        # Write to a temp file and rename so concurrent readers (other
+        # Streamlit sessions, batch workers) never see a half-written entry.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            old_size = os.stat(path).st_size  # overwriting an entry replaces its bytes
+        except FileNotFoundError:
+            old_size = 0
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st.st_mtime, st.st_size
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        target = int(self.max_bytes * 0.9)  # leave headroom so we don't evict on every write
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def default_cache():
+    """Process-wide cache under CACHE_DIR (override with SKILLBOT_OCR_CACHE_DIR)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = OCRCache(os.environ.get("SKILLBOT_OCR_CACHE_DIR", CACHE_DIR))
+    return _default_cache
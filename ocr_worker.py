@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import traceback
+
+import pandas as pd
+
+import backend
+import jobs
+import LLM
+import OCR
+import ocr_cache
+import outbox
+import storage
+
+# ------------------------------------------------------------
+# Background worker for marksheet jobs
+#
+#   python ocr_worker.py            # run forever, polling skillbot.db
+#
+# Run one or more of these next to the Streamlit app. Each worker keeps the
+# OCR model warm and processes one job at a time: upload the marksheet to
+# Supabase storage, save the profile, OCR the marksheet, recommend a field
+# and write everything back to the job row for the UI to pick up.
+# ------------------------------------------------------------
+POLL_INTERVAL = 1.0
+NOT_SAVED = ("Your marksheet was read, but it could not be saved to your account "
+             "(the server has no Supabase connection configured).")
+
+
+def save_remote(job):
+    user_id = job["user_id"]
+    payload = job["payload"]
+
+    filename = f"{user_id}_{payload.get('filename', os.path.basename(job['file_path']))}"
+    with open(job["file_path"], "rb") as f:
+        # upsert so a retried job doesn't fail on its own earlier upload
+        backend.upload("marksheets", filename, f.read(), upsert=True)
+    marksheet_url = backend.public_url("marksheets", filename)
+
+    # Table writes go through the local outbox; its flusher sends them in batches
+    profile = payload.get("profile", {})
+    outbox.upsert("profiles", {
+        "user_id": user_id,
+        "full_name": profile.get("name"),
+        "gender": profile.get("gender"),
+        "age": profile.get("age"),
+        "qualification": profile.get("qualification"),
+        "marksheet_url": marksheet_url
+    }, key=user_id)
+
+    if payload.get("riasec") and payload.get("tci"):
+        personality = LLM.personality_from_scores(payload["riasec"], payload["tci"])
+        outbox.insert("test_results", {"user_id": user_id, **personality}, key=user_id)
+
+    return marksheet_url
+
+
+def save_local(job, marks, personality):
+    # Columnar copy for cohort runs (LLM.recommend_cohort on data/). Safe to
+    # repeat on retry: marks merge by max, the results row is checked by id.
+    storage.append_marks(marks, student_id=job["user_id"])
+    if not (job["payload"].get("riasec") and job["payload"].get("tci")):
+        return
+    result_id = f"job-{job['id']}"
+    if job["attempts"] > 1 and result_id in set(storage.read_results(columns=["id"])["id"]):
+        return
+    storage.append_results(pd.DataFrame([{
+        "id": result_id, "user_id": job["user_id"],
+        "created_at": pd.Timestamp.now(), **personality,
+    }]))
+
+
+def process_job(job, supabase=None):
+    payload = job["payload"]
+
+    marks = OCR.extract_marks_from_marksheet(job["file_path"], cache=ocr_cache.default_cache())
+
+    personality = LLM.personality_from_scores(payload.get("riasec"), payload.get("tci"))
+    best_field, subfields, field_scores = LLM.recommend(marks, personality)
+
+    if supabase is not None:
+        marksheet_url, warning = save_remote(job), None
+    else:
+        # Still worth returning the recommendation, but say the save didn't happen
+        print(f"⚠️ Job {job['id']}: Supabase not configured, upload and profile/result save skipped")
+        marksheet_url, warning = None, NOT_SAVED
+
+    save_local(job, marks, personality)
+
+    return {
+        "marks": marks.to_dict(orient="records"),
+        "best_field": best_field,
+        "subfields": subfields,
+        "field_scores": field_scores,
+        "marksheet_url": marksheet_url,
+        "warning": warning,
+    }
+
+
+def run_worker(db_path=jobs.DB_PATH, poll_interval=POLL_INTERVAL, once=False):
+    conn = jobs.connect(db_path)
+    # Without SUPABASE_URL/KEY the worker still does OCR + recommendation,
+    # skips the remote save and tells the user so in the job result.
+    supabase = backend.client()
+    if supabase is None:
+        print("⚠️ SUPABASE_URL / SUPABASE_KEY not set: marksheets will not be uploaded "
+              "and profiles/results will not be saved remotely")
+    OCR.warm_up()
+    jobs.requeue_stale(conn)
+    storage.start_compactor()
+    if supabase is not None:
+        outbox.start_flusher(supabase)
+    print("👷 Marksheet worker started")
+
+    while True:
+        job = jobs.claim_next(conn)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        print(f"📥 Job {job['id']} ({job['file_path']})")
+        try:
+            result = process_job(job, supabase)
+        except Exception as e:
+            traceback.print_exc()
+            status = jobs.fail(conn, job["id"], f"{type(e).__name__}: {e}", job["attempts"])
+            if status == "failed":
+                jobs.remove_spool(job)
+        else:
+            jobs.complete(conn, job["id"], result)
+            jobs.remove_spool(job)
+            print(f"✅ Job {job['id']} done: {result['best_field']}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    run_worker(once="--once" in sys.argv)
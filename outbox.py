@@ -0,0 +1,302 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+
+DB_PATH = "skillbot.db"
+
+# ------------------------------------------------------------
+# Local write-ahead buffer for Supabase table writes
+#
+# ocr_worker.py calls insert()/upsert(), which only append a row to the
+# supabase_outbox table in skillbot.db and return immediately. A flusher
+# thread (start_flusher) sends pending rows in batches, one request per
+# (table, op) run, and deletes them once Supabase accepts them.
+#
+#   pending -> sending -> (deleted)
+#                      -> pending again, with exponential backoff
+#                      -> dead, after MAX_ATTEMPTS
+#
+# Delivery is at-least-once: a flusher that dies mid-request leaves its rows
+# 'sending', and requeue_stale() sends them again.
+#
+# Rows queued with a key (upsert(..., key=user_id)) are delivered in order
+# per (table, key): a row is not claimed while an older one for the same key
+# is still pending or sending, so a retried upsert can never land after a
+# newer one. Queuing an upsert also drops older not-yet-sent upserts for its
+# key, since only the newest would survive anyway.
+# ------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS supabase_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL,
+    row TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at REAL,
+    dedupe_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_supabase_outbox_due ON supabase_outbox (status, next_attempt_at, id);
+CREATE INDEX IF NOT EXISTS idx_supabase_outbox_key ON supabase_outbox (table_name, dedupe_key, id);
+"""
+
+OPS = ("insert", "upsert")
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 2.0       # seconds between flushes when idle
+BACKOFF_BASE = 2.0         # first retry after ~2s, then 4s, 8s, ...
+BACKOFF_MAX = 300.0
+MAX_ATTEMPTS = 10
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ---------------- producer side ----------------
+def enqueue(table_name, row, op="insert", db_path=DB_PATH, key=None):
+    if op not in OPS:
+        raise ValueError(f"unknown op {op!r}")
+    key = None if key is None else str(key)
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if op == "upsert" and key is not None:
+                # Superseded before it was sent; rows already 'sending' stay
+                # and keep this one waiting behind them.
+                conn.execute(
+                    "DELETE FROM supabase_outbox WHERE table_name = ? AND dedupe_key = ? "
+                    "AND op = 'upsert' AND status = 'pending'",
+                    (table_name, key),
+                )
+            cur = conn.execute(
+                "INSERT INTO supabase_outbox (table_name, op, row, dedupe_key) VALUES (?, ?, ?, ?)",
+                (table_name, op, json.dumps(row, default=str), key),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def insert(table_name, row, db_path=DB_PATH, key=None):
+    return enqueue(table_name, row, "insert", db_path, key)
+
+
+def upsert(table_name, row, db_path=DB_PATH, key=None):
+    return enqueue(table_name, row, "upsert", db_path, key)
+
+
+def pending_count(db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM supabase_outbox WHERE status IN ('pending', 'sending')"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+# ---------------- flusher side ----------------
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)  # jitter so processes don't retry in lockstep
+
+
+def claim_batch(conn, limit=BATCH_SIZE, now=None):
+    now = time.time() if now is None else now
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # A keyed row waits while an older row for its key is unsent (e.g.
+        # backing off after a failure), so per-key order survives retries.
+        rows = conn.execute(
+            "SELECT * FROM supabase_outbox o WHERE status = 'pending' AND next_attempt_at <= ? "
+            "AND (dedupe_key IS NULL OR NOT EXISTS ("
+            "    SELECT 1 FROM supabase_outbox p WHERE p.table_name = o.table_name "
+            "    AND p.dedupe_key = o.dedupe_key AND p.id < o.id AND p.status IN ('pending', 'sending'))) "
+            "ORDER BY id LIMIT ?",
+            (now, limit),
+        ).fetchall()
+        conn.executemany(
+            "UPDATE supabase_outbox SET status = 'sending', updated_at = ? WHERE id = ?",
+            [(now, r["id"]) for r in rows],
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return [dict(r) for r in rows]
+
+
+def _runs(rows):
+    # Consecutive rows for the same table and op go out as one request,
+    # which keeps per-table ordering intact.
+    run = []
+    for r in rows:
+        if run and (r["table_name"], r["op"]) != (run[0]["table_name"], run[0]["op"]):
+            yield run
+            run = []
+        run.append(r)
+    if run:
+        yield run
+
+
+def _send(client, run):
+    table = client.table(run[0]["table_name"])
+    payload = [json.loads(r["row"]) for r in run]
+    getattr(table, run[0]["op"])(payload).execute()
+
+
+def _done(conn, run):
+    conn.executemany("DELETE FROM supabase_outbox WHERE id = ?", [(r["id"],) for r in run])
+
+
+def _failed(conn, row, error, now):
+    attempts = row["attempts"] + 1
+    status = "pending" if attempts < MAX_ATTEMPTS else "dead"
+    conn.execute(
+        "UPDATE supabase_outbox SET status = ?, attempts = ?, next_attempt_at = ?, error = ?, "
+        "updated_at = ? WHERE id = ?",
+        (status, attempts, now + backoff(attempts), f"{type(error).__name__}: {error}", now, row["id"]),
+    )
+
+
+def flush(client, conn, limit=BATCH_SIZE):
+    """Send one batch of due rows; returns how many were delivered."""
+    rows = claim_batch(conn, limit)
+    sent = 0
+    for run in _runs(rows):
+        try:
+            _send(client, run)
+        except Exception:
+            sent += _isolate(client, conn, run)
+        else:
+            _done(conn, run)
+            sent += len(run)
+    return sent
+
+
+def _isolate(client, conn, run):
+    # Probe with the first row alone: if that fails too, Supabase is most
+    # likely down and the whole run backs off. Otherwise the batch held a
+    # bad row, so send the rest one by one and back off only the rows
+    # that keep failing.
+    sent = 0
+    for i, r in enumerate(run):
+        try:
+            _send(client, [r])
+        except Exception as e:
+            if i == 0:
+                for rest in run:
+                    _failed(conn, rest, e, time.time())
+                return 0
+            _failed(conn, r, e, time.time())
+        else:
+            _done(conn, [r])
+            sent += 1
+    return sent
+
+
+def requeue_stale(conn, older_than_seconds=300):
+    """Put back rows left 'sending' by a flusher that died mid-request."""
+    conn.execute(
+        "UPDATE supabase_outbox SET status = 'pending' WHERE status = 'sending' AND updated_at < ?",
+        (time.time() - older_than_seconds,),
+    )
+
+
+def flush_all(client, db_path=DB_PATH):
+    """Flush until nothing is due (e.g. before shutting down); returns rows delivered."""
+    conn = connect(db_path)
+    try:
+        total = 0
+        while True:
+            sent = flush(client, conn)
+            total += sent
+            if sent == 0:
+                return total
+    finally:
+        conn.close()
+
+
+_flusher = None
+_flusher_lock = threading.Lock()
+
+def start_flusher(client, db_path=DB_PATH, interval=FLUSH_INTERVAL):
+    """Start the process-wide flusher thread once; later calls return the same thread."""
+    global _flusher
+    with _flusher_lock:
+        if _flusher is not None and _flusher.is_alive():
+            return _flusher
+
+        def loop():
+            conn = connect(db_path)
+            requeue_stale(conn)
+            while True:
+                try:
+                    sent = flush(client, conn)
+                except Exception as e:  # e.g. database is locked; try again next round
+                    print(f"⚠️ Outbox flush failed: {e}")
+                    sent = 0
+                if sent == 0:
+                    time.sleep(interval)
+
+        _flusher = threading.Thread(target=loop, name="supabase-outbox", daemon=True)
+        _flusher.start()
+        return _flusher
+
+
+# ---------------- local stand-in for the Supabase client ----------------
+class FakeClient:
+    """
+    Records writes in memory with the same table(...).insert/upsert(...).execute()
+    chain as supabase-py. fail_next makes the next N execute() calls raise.
+    """
+
+    class _Query:
+        def __init__(self, client, name, op, rows):
+            self.client, self.name, self.op, self.rows = client, name, op, rows
+
+        def execute(self):
+            with self.client.lock:
+                self.client.calls.append((self.name, self.op, len(self.rows)))
+                if self.client.fail_next > 0:
+                    self.client.fail_next -= 1
+                    raise ConnectionError("fake Supabase is unavailable")
+                self.client.tables.setdefault(self.name, []).extend(self.rows)
+            return self
+
+        @property
+        def data(self):
+            return self.rows
+
+    class _Table:
+        def __init__(self, client, name):
+            self.client, self.name = client, name
+
+        def insert(self, rows):
+            return FakeClient._Query(self.client, self.name, "insert", rows if isinstance(rows, list) else [rows])
+
+        def upsert(self, rows):
+            return FakeClient._Query(self.client, self.name, "upsert", rows if isinstance(rows, list) else [rows])
+
+    def __init__(self, fail_next=0):
+        self.tables = {}
+        self.calls = []
+        self.fail_next = fail_next
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return FakeClient._Table(self, name)
@@ -0,0 +1,130 @@
+import os
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+QUESTIONS_CSV = "questions.csv"
+TCI_QUESTIONS_CSV = "tci_questions.csv"
+CAREERS_CSV = "careers.csv"
+
+RIASEC_CODES = ("R", "I", "A", "S", "E", "C")
+
+# ------------------------------------------------------------
+# Question banks and career table, parsed once per process
+#
+# Streamlit re-executes the page script on every click, but imported
+# modules survive reruns, so everything parsed here is shared by all
+# sessions. A bank is re-read only when its file's mtime/size changes.
+#
+#   bank = load_riasec()
+#   bank.text[i]            -> question text   (read-only str array)
+#   bank.codes[i]           -> category index  (read-only int8 array)
+#   bank.labels[bank.codes] -> category labels ("R", "I", ... / TCI traits)
+#   bank.onehot             -> questions x labels 0/1 matrix (see scoring.py)
+# ------------------------------------------------------------
+def _frozen(a):
+    a.setflags(write=False)
+    return a
+
+
+class QuestionBank:
+    """A parsed question bank; its arrays are read-only and shared by every session."""
+
+    def __init__(self, text, labels, codes, column):
+        self.text = _frozen(np.asarray(text, dtype=object))
+        self.labels = _frozen(np.asarray(labels, dtype=object))
+        self.codes = _frozen(np.asarray(codes, dtype=np.int8))
+        self.column = column  # "category" (RIASEC) or "trait" (TCI)
+        # One-hot question -> category matrix for scoring.py, built once per bank
+        onehot = np.zeros((len(self.codes), len(self.labels)))
+        onehot[np.arange(len(self.codes)), self.codes] = 1
+        self.onehot = _frozen(onehot)
+        self.counts = _frozen(onehot.sum(axis=0))
+
+    def __len__(self):
+        return len(self.text)
+
+    def to_frame(self):
+        """A fresh (mutable) DataFrame of question + category/trait."""
+        return pd.DataFrame({"question": self.text, self.column: self.labels[self.codes]})
+
+
+def _bank(df, column, labels=None):
+    missing = {"question", column} - set(df.columns)
+    if missing:
+        raise ValueError(f"missing column(s) {sorted(missing)}")
+    df = df.dropna(subset=["question", column])
+    text = df["question"].astype(str).str.strip()
+    values = df[column].astype(str).str.strip()
+    if (text == "").any():
+        raise ValueError("empty question text")
+
+    if labels is None:
+        labels = list(dict.fromkeys(values))  # order of first appearance
+    unknown = set(values) - set(labels)
+    if unknown:
+        raise ValueError(f"unknown {column}(s) {sorted(unknown)}")
+    codes = pd.Categorical(values, categories=labels).codes
+    return QuestionBank(text.to_numpy(), labels, codes, column)
+
+
+def parse_riasec(path):
+    return _bank(pd.read_csv(path), "category", RIASEC_CODES)
+
+
+def parse_tci(path):
+    return _bank(pd.read_csv(path), "trait")
+
+
+def parse_careers(path):
+    # careers.csv isn't quoted: "R,Engineer, Electrician, ..." - everything
+    # after the first comma is the career list.
+    careers = {}
+    with open(path, encoding="utf-8") as f:
+        next(f, None)  # header
+        for line in f:
+            code, _, rest = line.strip().partition(",")
+            if code:
+                careers[code.strip()] = tuple(c.strip() for c in rest.split(",") if c.strip())
+    return MappingProxyType(careers)
+
+
+# ---------------- mtime-checked process cache ----------------
+_cache = {}
+_cache_lock = threading.Lock()
+
+def _load(path, parser):
+    st = os.stat(path)  # FileNotFoundError propagates to the page
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (os.path.abspath(path), parser)
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry[0] != stamp:
+            try:
+                value = parser(path)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from e
+            entry = _cache[key] = (stamp, value)
+    return entry[1]
+
+
+def load_riasec(path=QUESTIONS_CSV):
+    return _load(path, parse_riasec)
+
+
+def load_tci(path=TCI_QUESTIONS_CSV):
+    return _load(path, parse_tci)
+
+
+def load_careers(path=CAREERS_CSV):
+    """{RIASEC code: (career, ...)} as a read-only mapping."""
+    return _load(path, parse_careers)
+
+
+def load_all():
+    return load_riasec(), load_careers(), load_tci()
@@ -0,0 +1,68 @@
+import os
+
+import streamlit as st
+
+import scoring
+
+# ------------------------------------------------------------
+# Whole-test quiz forms
+#
+# The step-by-step quiz reruns the page script on every answer (~60 runs
+# per user for both tests). Here every question of a bank is rendered
+# inside one st.form: choosing answers happens in the browser without
+# touching the server, and "Submit" sends all of them in one request.
+#
+# SKILLBOT_QUIZ_MODE=step switches the pages back to one question per screen.
+# ------------------------------------------------------------
+FORM_MODE = os.environ.get("SKILLBOT_QUIZ_MODE", "form") != "step"
+
+RIASEC_OPTIONS = {
+    "Strongly Disagree": "😠",
+    "Disagree": "🙁",
+    "Neutral": "😐",
+    "Agree": "🙂",
+    "Strongly Agree": "🤩"
+}
+TCI_OPTIONS = {"T": "✅ True", "F": "❌ False"}
+
+
+def _answers_form(bank, key, options, format_func):
+    """Render bank as one form; returns the answer list once fully submitted, else None."""
+    keys = [f"{key}_{i}" for i in range(len(bank))]
+    with st.form(key):
+        for i, text in enumerate(bank.text):
+            st.radio(f"**{i + 1}.** {text}", list(options), index=None, horizontal=True,
+                     key=keys[i], format_func=format_func)
+        submitted = st.form_submit_button("Submit answers ➡️")
+    if not submitted:
+        return None
+
+    answers = [st.session_state.get(k) for k in keys]
+    missing = [str(i + 1) for i, a in enumerate(answers) if a is None]
+    if missing:
+        st.error(f"Please answer question(s) {', '.join(missing)}.")
+        return None
+
+    # Clear the widgets so a retake starts blank
+    for k in keys:
+        del st.session_state[k]
+    return answers
+
+
+def riasec_form(questions):
+    answers = _answers_form(questions, "riasec_form", RIASEC_OPTIONS,
+                            lambda label: f"{RIASEC_OPTIONS[label]} {label}")
+    if answers is not None:
+        st.session_state.answers = scoring.pack_answers(answers, scoring.RIASEC_RATINGS)
+        st.session_state.index = len(answers)
+        st.session_state.page = "riasec_results"
+        st.rerun()
+
+
+def tci_form(tci_questions):
+    answers = _answers_form(tci_questions, "tci_form", TCI_OPTIONS, TCI_OPTIONS.get)
+    if answers is not None:
+        st.session_state.tci_answers = scoring.pack_answers(answers, scoring.TCI_RATINGS)
+        st.session_state.tci_index = len(answers)
+        st.session_state.tci_page = "tci_results"
+        st.rerun()
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import sys
+import uuid
+
+import pandas as pd
+
+DB_PATH = "skillbot.db"
+RESPONSES_FILE = "responses/responses.xlsx"
+
+# ------------------------------------------------------------
+# Interest-profiler responses (app1.py), one row per answered question
+#
+# Appending a finished test is a single INSERT transaction, so it costs
+# the same no matter how many tests are already stored, and WAL mode lets
+# several Streamlit processes append at once without clobbering each
+# other (the old workbook was read, extended and rewritten in full).
+#
+# Staff who want the workbook can export it on demand:
+#
+#   python responses.py export [responses/responses.xlsx]
+#   python responses.py import [responses/responses.xlsx]   # one-off, old workbook
+# ------------------------------------------------------------
+COLUMNS = ["id", "question", "category", "answer", "username", "email"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submission_id TEXT NOT NULL,
+    submitted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    id INTEGER,
+    question TEXT,
+    category TEXT,
+    answer TEXT,
+    username TEXT,
+    email TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_submission ON responses (submission_id);
+"""
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _value(v):
+    return None if pd.isna(v) else (v.item() if hasattr(v, "item") else v)
+
+
+def append(df, db_path=DB_PATH):
+    """Store one finished test (the workbook's columns); returns its submission id."""
+    submission_id = uuid.uuid4().hex
+    rows = df.reindex(columns=COLUMNS)
+    conn = connect(db_path)
+    try:
+        with conn:  # one transaction for the whole test
+            conn.executemany(
+                f"INSERT INTO responses (submission_id, {', '.join(COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(COLUMNS))})",
+                [(submission_id, *map(_value, r)) for r in rows.itertuples(index=False)],
+            )
+    finally:
+        conn.close()
+    return submission_id
+
+
+def load(db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        return pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM responses ORDER BY row_id", conn)
+    finally:
+        conn.close()
+
+
+def export_excel(path=RESPONSES_FILE, db_path=DB_PATH):
+    """Write every stored response to an .xlsx workbook (same layout as before)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = os.path.join(os.path.dirname(path) or ".", "." + os.path.basename(path) + ".tmp.xlsx")
+    load(db_path).to_excel(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def import_excel(path=RESPONSES_FILE, db_path=DB_PATH):
+    """One-off import of the old workbook; each 30-row block becomes one submission."""
+    df = pd.read_excel(path)
+    block = df["id"].eq(df["id"].iloc[0]).cumsum() if len(df) else []
+    for _, test in df.groupby(block, sort=False):
+        append(test, db_path)
+    return len(df)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    target = sys.argv[2] if len(sys.argv) > 2 else RESPONSES_FILE
+    if command == "export":
+        print(f"💾 Responses exported to {export_excel(target)}")
+    elif command == "import":
+        print(f"📥 Imported {import_excel(target)} rows from {target}")
+    else:
+        sys.exit(f"unknown command {command!r} (use export or import)")
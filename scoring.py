@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------
+# RIASEC / TCI scoring as matrix products
+#
+# Answers are turned into a numeric vector (one value per question) and
+# multiplied by the bank's precomputed one-hot question -> category matrix:
+#
+#   sums  = nan_to_num(values) @ bank.onehot     # (n_questions,) -> (n_labels,)
+#   means = sums / (~isnan(values) @ bank.onehot)
+#
+# Unanswered questions (NaN) are skipped per category, as the old groupby
+# mean did, instead of turning every category's score into NaN.
+# values may also be 2D (respondents x questions) to rescore a whole
+# cohort in one product.
+# ------------------------------------------------------------
+RIASEC_RATINGS = {"Strongly Disagree": 1, "Disagree": 2, "Neutral": 3, "Agree": 4, "Strongly Agree": 5}
+TCI_RATINGS = {"T": 1, "F": 0}
+
+
+def encode(answers, ratings):
+    """Answer labels (1D list or 2D rows) -> float array; unknown labels become NaN."""
+    answers = np.asarray(answers, dtype=object)
+    lookup = np.vectorize(lambda a: ratings.get(a, np.nan), otypes=[float])
+    return lookup(answers) if answers.size else answers.astype(float)
+
+
+# ---------------- compact per-session encoding ----------------
+# Session state keeps answers as a fixed-length int8 array indexed by
+# question position, holding the rating itself (1-5 / 1-0) or UNANSWERED,
+# and scores as float32 arrays in bank.labels order - instead of lists of
+# label strings and pandas Series in every session. Unpacked scores are
+# rounded back to SCORE_DECIMALS so float32 noise (3.4 -> 3.4000000953674316)
+# never reaches the pages or the saved results.
+UNANSWERED = -1
+SCORE_DECIMALS = 4
+
+
+def blank_answers(bank):
+    return np.full(len(bank), UNANSWERED, dtype=np.int8)
+
+
+def pack_answers(answers, ratings, n=None):
+    """Answer labels -> int8 array (padded with UNANSWERED up to n)."""
+    packed = np.full(len(answers) if n is None else n, UNANSWERED, dtype=np.int8)
+    for i, a in enumerate(answers):
+        packed[i] = ratings.get(a, UNANSWERED)
+    return packed
+
+
+def unpack_answers(packed, ratings):
+    """int8 array -> answer labels, None where unanswered."""
+    labels = {v: k for k, v in ratings.items()}
+    return [labels.get(int(v)) for v in packed]
+
+
+def answered(packed):
+    return int(np.count_nonzero(np.asarray(packed) != UNANSWERED))
+
+
+def _values(answers, ratings):
+    if isinstance(answers, np.ndarray) and answers.dtype == np.int8:
+        return np.where(answers == UNANSWERED, np.nan, answers.astype(float))
+    return encode(answers, ratings)
+
+
+def pack_scores(bank, scores):
+    """Score Series -> float32 array in bank.labels order."""
+    return scores.reindex(bank.labels).to_numpy(dtype=np.float32)
+
+
+def _unpack_scores(packed):
+    return np.round(np.asarray(packed, dtype=float), SCORE_DECIMALS)
+
+
+def unpack_riasec(bank, packed):
+    """float32 scores -> the Series the pages show (highest first); None stays None."""
+    if packed is None:
+        return None
+    return _series(bank, _unpack_scores(packed)).sort_values(ascending=False)
+
+
+def unpack_tci(bank, packed):
+    if packed is None:
+        return None
+    return _series(bank, _unpack_scores(packed)).astype("int64")
+
+
+def score(bank, values, how="mean"):
+    """values: (n_questions,) or (n_respondents, n_questions) numeric answers."""
+    values = np.asarray(values, dtype=float)
+    if values.shape[-1] != len(bank):
+        raise ValueError(f"expected {len(bank)} answers, got {values.shape[-1]}")
+    missing = np.isnan(values)
+    totals = np.where(missing, 0.0, values) @ bank.onehot
+    if how == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return totals / ((~missing) @ bank.onehot)
+    if how == "sum":
+        return totals
+    raise ValueError(f"unknown aggregation {how!r}")
+
+
+def _series(bank, scores):
+    # Same shape as the old groupby: labels that have questions, sorted
+    present = bank.counts > 0
+    return pd.Series(scores[present], index=pd.Index(bank.labels[present], name=bank.column)).sort_index()
+
+
+def riasec_scores(bank, answers):
+    """Mean rating per RIASEC category for one respondent (labels or packed answers)."""
+    return _series(bank, score(bank, _values(answers, RIASEC_RATINGS), "mean"))
+
+
+def tci_scores(bank, answers):
+    """Number of True answers per TCI trait for one respondent (labels or packed answers)."""
+    return _series(bank, score(bank, _values(answers, TCI_RATINGS), "sum")).astype("int64")
+
+
+def score_many(bank, answer_rows, ratings, how="mean"):
+    """Rescore many respondents: returns a DataFrame (respondents x labels)."""
+    scores = score(bank, encode(answer_rows, ratings), how)
+    return pd.DataFrame(np.atleast_2d(scores), columns=bank.labels)
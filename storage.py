@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ------------------------------------------------------------
+# Columnar storage for marksheets and test results
+#
+#   data/marks/ingest_date=2025-11-17/part-<id>.parquet
+#   data/results/ingest_date=2025-11-17/part-<id>.parquet
+#
+# Every append writes one new Parquet file (a segment) into today's
+# partition, so nothing already stored is re-read or rewritten. Readers
+# load only the columns they ask for, memory-mapped, and can prune
+# partitions by date.
+#
+# Marks are deduplicated on (student_id, subject) by keeping the max, the
+# same rule load_marksheet applies. Because max is idempotent, a row that
+# is stored twice is harmless - which is what lets compact() merge a
+# partition's segments in the background without locking out writers.
+# ------------------------------------------------------------
+DATA_DIR = "data"
+MARKS_ROOT = os.path.join(DATA_DIR, "marks")
+RESULTS_ROOT = os.path.join(DATA_DIR, "results")
+
+MARKS_SCHEMA = pa.schema([
+    ("student_id", pa.string()),
+    ("subject", pa.string()),
+    ("max", pa.int16()),
+    ("obtained", pa.int16()),
+])
+MARKS_LIMIT = 2 ** 15 - 1
+
+RIASEC_COLUMNS = ["riasec_R", "riasec_I", "riasec_A", "riasec_S", "riasec_E", "riasec_C"]
+TCI_COLUMNS = ["tci_Persistence", "tci_HarmAvoidance", "tci_Cooperativeness", "tci_NoveltySeeking",
+               "tci_RewardDependence", "tci_SelfDirectedness", "tci_SelfTranscendence"]
+
+RESULTS_SCHEMA = pa.schema(
+    [("id", pa.string()), ("user_id", pa.string()), ("created_at", pa.timestamp("us"))]
+    + [(c, pa.float32()) for c in RIASEC_COLUMNS + TCI_COLUMNS]
+)
+
+PARTITIONING = ds.partitioning(pa.schema([("ingest_date", pa.string())]), flavor="hive")
+
+
+# ---------------- writing ----------------
+def _write_part(df, schema, root, ingest_date=None):
+    ingest_date = str(ingest_date or date.today())
+    part_dir = os.path.join(root, f"ingest_date={ingest_date}")
+    os.makedirs(part_dir, exist_ok=True)
+
+    table = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    path = os.path.join(part_dir, f"part-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:12]}.parquet")
+    # Readers only ever see complete files (dot-files are skipped by pyarrow)
+    tmp = os.path.join(part_dir, "." + os.path.basename(path) + ".tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def marks_frame(df, student_id=None):
+    """Normalise an OCR frame (Subject / Maximum / Obtained [/ id]) to MARKS_SCHEMA columns."""
+    df = df.rename(columns={"id": "student_id", "Subject": "subject",
+                            "Maximum": "max", "Obtained": "obtained"})
+    if student_id is not None:
+        df = df.assign(student_id=student_id)
+    out = pd.DataFrame({
+        "student_id": df["student_id"].astype(str),
+        "subject": df["subject"].astype(str).str.upper().str.strip(),
+        "max": pd.to_numeric(df["max"], errors="coerce"),
+        "obtained": pd.to_numeric(df["obtained"], errors="coerce"),
+    })
+    # Anything outside int16 is OCR noise (roll numbers, dates) and would wrap on the cast
+    valid = out["max"].between(0, MARKS_LIMIT) & out["obtained"].between(0, MARKS_LIMIT)
+    return out[valid].astype({"max": "int16", "obtained": "int16"})
+
+
+def append_marks(df, student_id=None, root=MARKS_ROOT, ingest_date=None):
+    return _write_part(marks_frame(df, student_id), MARKS_SCHEMA, root, ingest_date)
+
+
+def append_results(df, root=RESULTS_ROOT, ingest_date=None):
+    """df: response.csv-style rows (id, user_id, created_at, riasec_*, tci_*)."""
+    df = df.reindex(columns=RESULTS_SCHEMA.names)
+    df["id"] = df["id"].fillna("").astype(str)
+    df["user_id"] = df["user_id"].astype(str)
+    # Supabase exports carry nanosecond-looking fractions; the schema stores microseconds
+    df["created_at"] = pd.to_datetime(df["created_at"], format="mixed").fillna(pd.Timestamp.now()).dt.floor("us")
+    return _write_part(df, RESULTS_SCHEMA, root, ingest_date)
+
+
+# ---------------- reading ----------------
+def _read(root, schema, columns=None, since=None):
+    if columns is not None:
+        columns = list(columns)
+    if not os.path.isdir(root):
+        names = columns or schema.names
+        return pa.schema([schema.field(n) for n in names if n in schema.names]).empty_table().to_pandas()
+
+    filters = [("ingest_date", ">=", str(since))] if since else None
+    for attempt in range(3):
+        try:
+            table = pq.read_table(root, columns=columns, filters=filters, schema=schema.append(
+                pa.field("ingest_date", pa.string())), partitioning=PARTITIONING, memory_map=True)
+            return table.to_pandas()
+        except FileNotFoundError:
+            # A segment was compacted away between listing and opening it
+            if attempt == 2:
+                raise
+
+
+def read_marks(columns=None, since=None, root=MARKS_ROOT):
+    """Marks as a DataFrame; pass columns to read only those, since=YYYY-MM-DD to skip older partitions."""
+    return _read(root, MARKS_SCHEMA, columns, since)
+
+
+def dedupe_marks(df):
+    """One row per (student_id, subject), keeping the highest marks."""
+    return df.groupby(["student_id", "subject"], as_index=False, sort=False)[["max", "obtained"]].max()
+
+
+def read_marks_merged(since=None, root=MARKS_ROOT):
+    return dedupe_marks(read_marks(columns=MARKS_SCHEMA.names, since=since, root=root))
+
+
+def read_results(columns=None, since=None, root=RESULTS_ROOT):
+    return _read(root, RESULTS_SCHEMA, columns, since)
+
+
+def is_columnar(path):
+    path = os.fspath(path)
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+# ---------------- compaction ----------------
+COMPACT_MIN_SEGMENTS = 16
+COMPACT_INTERVAL = 300  # seconds
+
+
+def _segments(part_dir):
+    return sorted(
+        os.path.join(part_dir, name) for name in os.listdir(part_dir)
+        if name.endswith(".parquet") and not name.startswith(".")
+    )
+
+
+def compact_partition(part_dir, min_segments=COMPACT_MIN_SEGMENTS):
+    """Merge a marks partition's segments into one deduplicated file; returns segments removed."""
+    segments = _segments(part_dir)
+    if len(segments) < min_segments:
+        return 0
+
+    # Only the segments listed above are touched; anything appended
+    # meanwhile stays for the next run.
+    table = pq.read_table(segments, schema=MARKS_SCHEMA, memory_map=True)
+    merged = dedupe_marks(table.to_pandas())
+    table = pa.Table.from_pandas(merged, schema=MARKS_SCHEMA, preserve_index=False)
+
+    path = os.path.join(part_dir, f"compact-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:12]}.parquet")
+    tmp = os.path.join(part_dir, "." + os.path.basename(path) + ".tmp")
+    pq.write_table(table, tmp)
+    # The compacted file goes live before the segments go away, so readers
+    # see each row at least once; the overlap is absorbed by the max rule.
+    os.replace(tmp, path)
+    for segment in segments:
+        try:
+            os.remove(segment)
+        except FileNotFoundError:
+            pass  # another compactor got there first
+    return len(segments)
+
+
+def compact(root=MARKS_ROOT, min_segments=COMPACT_MIN_SEGMENTS):
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    for name in sorted(os.listdir(root)):
+        part_dir = os.path.join(root, name)
+        if name.startswith("ingest_date=") and os.path.isdir(part_dir):
+            removed += compact_partition(part_dir, min_segments)
+    return removed
+
+
+def start_compactor(root=MARKS_ROOT, interval=COMPACT_INTERVAL, min_segments=COMPACT_MIN_SEGMENTS):
+    """Compact root every interval seconds on a daemon thread."""
+    def loop():
+        while True:
+            try:
+                compact(root, min_segments)
+            except Exception as e:
+                print(f"⚠️ Compaction of {root} failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="marks-compactor", daemon=True)
+    thread.start()
+    return thread
+
+
+# ---------------- one-off import of the existing CSVs ----------------
+def import_marks_csv(csv_path="marksheet_merged.csv", root=MARKS_ROOT):
+    return append_marks(pd.read_csv(csv_path), root=root)
+
+
+def import_results_csv(csv_path="response.csv", root=RESULTS_ROOT):
+    return append_results(pd.read_csv(csv_path), root=root)
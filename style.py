@@ -1,6 +1,8 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+import question_bank
+import quiz_form
+import scoring
 
 # -------------------- PAGE SETUP --------------------
 st.set_page_config(page_title="SkillBot Career & Personality Profiler", layout="centered")
@@ -69,10 +71,9 @@ st.markdown("""
 
 # -------------------- LOAD DATA --------------------
 try:
-    questions = pd.read_csv("questions.csv")
-    careers = pd.read_csv("careers.csv")
-    tci_questions = pd.read_csv("tci_questions.csv")
-except FileNotFoundError as e:
+    # Parsed once per process and shared across reruns (see question_bank.py)
+    questions, careers, tci_questions = question_bank.load_all()
+except (FileNotFoundError, ValueError) as e:
     st.error(f"Error loading data file: {e}. Make sure 'questions.csv', 'careers.csv', and 'tci_questions.csv' are in the correct directory.")
     st.stop()
 
@@ -80,10 +81,10 @@ except FileNotFoundError as e:
 defaults = {
     "page": "intro", # Controls RIASEC internal page flow
     "index": 0,      # Controls RIASEC question index
-    "answers": [],   # Stores RIASEC answers
+    "answers": scoring.blank_answers(questions),   # Stores RIASEC answers
     "tci_page": "intro", # Controls TCI internal page flow
     "tci_index": 0,      # Controls TCI question index
-    "tci_answers": [],   # Stores TCI answers
+    "tci_answers": scoring.blank_answers(tci_questions),   # Stores TCI answers
     "riasec_scores": None,
     "tci_scores": None,
     "sidebar_choice": "Home", # Controls sidebar selection
@@ -98,14 +99,14 @@ def restart_all():
 
 # -------------------- TEST FLOW FUNCTIONS --------------------
 def next_question(selected):
-    st.session_state.answers.append(selected)
+    st.session_state.answers[st.session_state.index] = scoring.RIASEC_RATINGS[selected]
     st.session_state.index += 1
     if st.session_state.index >= len(questions):
         st.session_state.page = "riasec_results"
     st.rerun()
 
 def next_tci(selected):
-    st.session_state.tci_answers.append(selected)
+    st.session_state.tci_answers[st.session_state.tci_index] = scoring.TCI_RATINGS[selected]
     st.session_state.tci_index += 1
     if st.session_state.tci_index >= len(tci_questions):
         st.session_state.tci_page = "tci_results"
@@ -139,7 +140,7 @@ if choice == "Home":
     if st.button("Start Now ➡️"):
         st.session_state.page = "quiz"
         st.session_state.index = 0
-        st.session_state.answers = []
+        st.session_state.answers = scoring.blank_answers(questions)
         st.session_state.sidebar_choice = "RIASEC Test"
         st.rerun()
 
@@ -153,14 +154,16 @@ elif choice == "RIASEC Test":
         if st.button("Start RIASEC Test"):
             st.session_state.page = "quiz"
             st.session_state.index = 0
-            st.session_state.answers = []
+            st.session_state.answers = scoring.blank_answers(questions)
             st.rerun()
 
     elif st.session_state.page == "quiz":
-        if st.session_state.index < len(questions):
+        if quiz_form.FORM_MODE:
+            quiz_form.riasec_form(questions)
+        elif st.session_state.index < len(questions):
             q_idx = st.session_state.index
-            q = questions.iloc[q_idx]
-            st.markdown(f"<div class='question-box'><h3>Question {q_idx + 1} of {len(questions)}</h3><p>{q['question']}</p></div>", unsafe_allow_html=True)
+            q = questions.text[q_idx]
+            st.markdown(f"<div class='question-box'><h3>Question {q_idx + 1} of {len(questions)}</h3><p>{q}</p></div>", unsafe_allow_html=True)
             options = {
                 "Strongly Disagree": "😠",
                 "Disagree": "🙁",
@@ -178,15 +181,11 @@ elif choice == "RIASEC Test":
 
     elif st.session_state.page == "riasec_results":
         st.title("🎯 Your RIASEC Profile")
-        if not st.session_state.answers:
+        if not scoring.answered(st.session_state.answers):
             st.warning("Please complete the RIASEC test first.")
         else:
-            df = questions.copy()
-            df["answer"] = st.session_state.answers
-            rating_map = {"Strongly Disagree": 1, "Disagree": 2, "Neutral": 3, "Agree": 4, "Strongly Agree": 5}
-            df["score"] = df["answer"].map(rating_map)
-            riasec_scores = df.groupby("category")["score"].mean().sort_values(ascending=False)
-            st.session_state.riasec_scores = riasec_scores
+            riasec_scores = scoring.riasec_scores(questions, st.session_state.answers).sort_values(ascending=False)
+            st.session_state.riasec_scores = scoring.pack_scores(questions, riasec_scores)
 
             st.bar_chart(riasec_scores)
             top = riasec_scores.head(3).index.tolist()
@@ -195,13 +194,13 @@ elif choice == "RIASEC Test":
             if st.button("Next ➡️ Go to TCI Test"):
                 st.session_state.tci_page = "intro"
                 st.session_state.tci_index = 0
-                st.session_state.tci_answers = []
+                st.session_state.tci_answers = scoring.blank_answers(tci_questions)
                 st.session_state.sidebar_choice = "TCI Test"
                 st.rerun()
             if st.button("🔁 Restart RIASEC Test"):
                 st.session_state.page = "intro"
                 st.session_state.index = 0
-                st.session_state.answers = []
+                st.session_state.answers = scoring.blank_answers(questions)
                 st.rerun()
 
 # =====================================================
@@ -218,14 +217,16 @@ elif choice == "TCI Test":
         if st.button("Start TCI Test"):
             st.session_state.tci_page = "quiz"
             st.session_state.tci_index = 0
-            st.session_state.tci_answers = []
+            st.session_state.tci_answers = scoring.blank_answers(tci_questions)
             st.rerun()
 
     elif st.session_state.tci_page == "quiz":
-        if st.session_state.tci_index < len(tci_questions):
+        if quiz_form.FORM_MODE:
+            quiz_form.tci_form(tci_questions)
+        elif st.session_state.tci_index < len(tci_questions):
             q_idx = st.session_state.tci_index
-            q = tci_questions.iloc[q_idx]
-            st.markdown(f"<div class='question-box'><h3>Question {q_idx + 1} of {len(tci_questions)}</h3><p>{q['question']}</p></div>", unsafe_allow_html=True)
+            q = tci_questions.text[q_idx]
+            st.markdown(f"<div class='question-box'><h3>Question {q_idx + 1} of {len(tci_questions)}</h3><p>{q}</p></div>", unsafe_allow_html=True)
             cols = st.columns(2)
             if cols[0].button("✅ True", key=f"tci_q{q_idx}_true"):
                 next_tci("T")
@@ -238,14 +239,11 @@ elif choice == "TCI Test":
     elif st.session_state.tci_page == "tci_results":
         st.title("🧩 Your TCI Personality Profile")
 
-        if not st.session_state.tci_answers:
+        if not scoring.answered(st.session_state.tci_answers):
             st.warning("Please complete the TCI test first.")
         else:
-            df = tci_questions.copy()
-            df["answer"] = st.session_state.tci_answers
-            df["score"] = df["answer"].map({"T": 1, "F": 0})
-            tci_scores = df.groupby("trait")["score"].sum()
-            st.session_state.tci_scores = tci_scores
+            tci_scores = scoring.tci_scores(tci_questions, st.session_state.tci_answers)
+            st.session_state.tci_scores = scoring.pack_scores(tci_questions, tci_scores)
 
             fig = px.bar(
                 tci_scores,
@@ -264,7 +262,7 @@ elif choice == "TCI Test":
             if st.button("🔁 Restart TCI Test"):
                 st.session_state.tci_page = "intro"
                 st.session_state.tci_index = 0
-                st.session_state.tci_answers = []
+                st.session_state.tci_answers = scoring.blank_answers(tci_questions)
                 st.rerun()
 
 # =====================================================
@@ -273,8 +271,8 @@ elif choice == "TCI Test":
 elif choice == "Dashboard":
     st.title("📊 Combined Career & Personality Dashboard")
 
-    riasec_scores = st.session_state.get("riasec_scores", None)
-    tci_scores = st.session_state.get("tci_scores", None)
+    riasec_scores = scoring.unpack_riasec(questions, st.session_state.get("riasec_scores"))
+    tci_scores = scoring.unpack_tci(tci_questions, st.session_state.get("tci_scores"))
 
     if riasec_scores is None or tci_scores is None:
         st.warning("⚠️ Please complete both tests first (RIASEC and TCI).")
@@ -0,0 +1,71 @@
+import types
+
+import pytest
+
+pytest.importorskip("streamlit")
+import auth  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # auth uses skillbot.db / users.csv relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(auth, "PASSWORD_ITERATIONS", 1000)
+    monkeypatch.setattr(auth, "_migrated", False)
+    monkeypatch.setattr(auth, "st", types.SimpleNamespace(session_state={}))
+    return tmp_path
+
+
+def test_hash_round_trip():
+    stored = auth.hash_password("s3cret", iterations=1000)
+    assert stored.startswith("pbkdf2_sha256$1000$")
+    assert auth.verify_password("s3cret", stored)
+    assert not auth.verify_password("wrong", stored)
+    assert stored != auth.hash_password("s3cret", iterations=1000)  # salted
+
+
+@pytest.mark.parametrize("stored", [
+    "", "plain-text", "md5$1$abc$def", "pbkdf2_sha256$x$c2FsdA==$aGFzaA==",
+    "pbkdf2_sha256$1000$not base64!$aGFzaA==", "pbkdf2_sha256$0$c2FsdA==$aGFzaA==", None,
+])
+def test_malformed_hash_is_rejected_not_raised(stored):
+    assert auth.verify_password("anything", stored) is False
+
+
+def test_signup_then_login(store):
+    assert auth.signup("Alice@Example.com ", "pw")
+    assert not auth.signup("alice@example.com", "other")  # same address
+    assert auth.login("ALICE@example.com", "pw")
+    assert auth.st.session_state["email"] == "alice@example.com"
+    assert not auth.login("alice@example.com", "nope")
+
+
+def test_usernames_keep_their_case(store):
+    assert auth.signup("Bob", "pw1")
+    assert auth.signup("bob", "pw2")
+    assert auth.login("Bob", "pw1") and not auth.login("Bob", "pw2")
+
+
+def test_unknown_account_still_hashes(store, monkeypatch):
+    calls = []
+    real = auth.verify_password
+    monkeypatch.setattr(auth, "verify_password", lambda p, s: calls.append(s) or real(p, s))
+    assert not auth.login("nobody@example.com", "pw")
+    assert len(calls) == 1
+
+
+def test_login_upgrades_iterations(store, monkeypatch):
+    assert auth.signup("carol@example.com", "pw")
+    monkeypatch.setattr(auth, "PASSWORD_ITERATIONS", 2000)
+    assert auth.login("carol@example.com", "pw")
+    conn = auth.connect()
+    (stored,) = conn.execute("SELECT password_hash FROM users").fetchone()
+    conn.close()
+    assert stored.startswith("pbkdf2_sha256$2000$")
+
+
+def test_migrate_csv(store):
+    (store / "users.csv").write_text("username,password\nDana@Example.com,pw\nEve,pw2\n")
+    assert auth.migrate_csv() == 2
+    assert auth.login("dana@example.com", "pw")
+    assert auth.login("Eve", "pw2")
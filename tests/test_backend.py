@@ -0,0 +1,77 @@
+import pytest
+
+import backend
+
+
+@pytest.fixture
+def unconfigured(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no .env here
+    for var in ("SUPABASE_URL", "SUPABASE_KEY"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(backend, "_config", None)
+    monkeypatch.setattr(backend, "_client", None)
+
+
+def test_load_config_reads_env(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SKILLBOT_SUPABASE_TIMEOUT", "2.5")
+    monkeypatch.setenv("SKILLBOT_SUPABASE_MAX_CONCURRENCY", "3")
+    config = backend.load_config()
+    assert config["timeout"] == 2.5 and config["max_concurrency"] == 3
+    assert config["max_connections"] == 20  # default
+
+
+def test_unconfigured_backend(unconfigured):
+    assert not backend.configured()
+    assert backend.client() is None
+    with pytest.raises(backend.NotConfigured):
+        backend.require_client()
+    with pytest.raises(backend.NotConfigured):
+        backend.sign_in("a@example.com", "pw")
+    assert backend.health() == {"ok": False, "configured": False, "latency_ms": None, "error": "not configured"}
+
+
+def test_call_records_latency_and_errors(unconfigured, monkeypatch):
+    monkeypatch.setattr(backend, "_metrics", backend.Metrics())
+    assert backend.call("profiles.select", lambda x: x * 2, 21) == 42
+    with pytest.raises(ConnectionError):
+        backend.call("profiles.select", lambda: (_ for _ in ()).throw(ConnectionError("down")))
+
+    op = backend.metrics()["ops"]["profiles.select"]
+    assert op["count"] == 2 and op["errors"] == 1
+    assert op["last_error"] == "ConnectionError: down"
+    assert op["p50_ms"] is not None
+    assert backend.metrics()["in_flight"] == 0
+
+
+def test_metered_builder_runs_execute_through_call(unconfigured, monkeypatch):
+    monkeypatch.setattr(backend, "_metrics", backend.Metrics())
+
+    class Query:
+        def select(self, *_):
+            return self
+
+        def limit(self, _):
+            return self
+
+        def execute(self):
+            return "rows"
+
+    client = backend.Client(type("Raw", (), {"table": lambda self, name: Query()})())
+    assert client.table("profiles").select("*").limit(1).execute() == "rows"
+    assert list(backend.metrics()["ops"]) == ["profiles.select"]
+
+
+def test_auth_clients_share_one_http_client(unconfigured, monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+    monkeypatch.setattr(backend, "_auth_http", None)
+    built, created = [], []
+    monkeypatch.setattr(backend, "_http_client", lambda config: built.append(object()) or built[-1])
+    monkeypatch.setattr(backend, "_create", lambda config, http, **extra: created.append((http, extra)))
+
+    backend._auth_client()
+    backend._auth_client()
+    assert len(built) == 1
+    assert [http for http, _ in created] == [built[0], built[0]]
+    assert created[0][1] == {"auto_refresh_token": False, "persist_session": False}
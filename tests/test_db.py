@@ -0,0 +1,150 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+import db
+
+TCI = list(db.TCI_COLUMNS)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "skillbot.db")
+
+
+def _riasec(**scores):
+    return {code: scores.get(code, 3.0) for code in "RIASEC"}
+
+
+def _aggregates(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall())
+                for table in db.AGGREGATE_TABLES}
+    finally:
+        conn.close()
+
+
+def _rebuilt(path):
+    with db.connection(path, write=True) as conn:
+        db._rebuild_aggregates(conn)
+    return _aggregates(path)
+
+
+def test_write_transactions_take_the_lock_up_front(path):
+    db.pool(path)
+    other = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        with db.connection(path) as conn:          # deferred: readers don't lock
+            conn.execute("SELECT COUNT(*) FROM profiles").fetchone()
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("COMMIT")
+        with db.connection(path, write=True):
+            with pytest.raises(sqlite3.OperationalError):
+                other.execute("BEGIN IMMEDIATE")
+    finally:
+        other.close()
+
+
+def test_migrates_baseline_database(path):
+    # The tables as the pages created them before db.py existed
+    conn = sqlite3.connect(path)
+    conn.executescript(db.SCHEMA)
+    conn.execute("INSERT INTO profiles (name, school, education) VALUES ('amna', 'GHS', '10')")
+    conn.execute("INSERT INTO results (user_name, test_type, result_data) VALUES (?, 'riasec', ?)",
+                 ("amna", json.dumps(_riasec(R=5.0))))
+    conn.execute("INSERT INTO results (user_name, test_type, result_data) VALUES ('amna', 'tci', 'not json')")
+    conn.commit()
+    conn.close()
+
+    (latest_tci, latest_riasec) = db.history("amna", db_path=path)
+    assert latest_riasec["result_data"]["R"] == 5.0
+    assert latest_tci["result_data"]["Persistence"] is None
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+    conn.close()
+    assert db.cohorts("school", db_path=path) == {"GHS": 1}
+    assert db.cohort_summary("school", "GHS", db_path=path)["means"]["riasec"]["R"] == (1, 5.0, 0.0)
+
+    db.save_result("amna", "riasec", _riasec(R=1.0), db_path=path)
+    conn = sqlite3.connect(path)
+    ids = conn.execute("SELECT student_id FROM profiles UNION SELECT student_id FROM results").fetchall()
+    conn.close()
+    assert ids == [(1,)]  # existing and new rows share the id assigned during migration
+    assert db.cohorts("school", db_path=path) == {"GHS": 1}
+
+
+def test_save_and_read_results(path):
+    db.save_profile("bilal", 15, "M", "9", "GHS", db_path=path)
+    db.save_test_results("bilal", _riasec(I=4.5), {t: 2 for t in TCI}, db_path=path)
+    assert db.get_profile("bilal", db_path=path)["school"] == "GHS"
+    assert [r["test_type"] for r in db.history("bilal", db_path=path)] == ["tci", "riasec"]
+    assert db.history("bilal", "riasec", db_path=path)[0]["result_data"]["I"] == 4.5
+    with pytest.raises(ValueError):
+        db.save_result("bilal", "mbti", {}, db_path=path)
+
+
+def test_result_saved_before_profile_follows_the_profile(path):
+    db.save_result("sara", "riasec", _riasec(), db_path=path)
+    db.save_profile("sara", school="GHS", education="10", db_path=path)
+    db.save_profile("omar", school="GHS", education="10", db_path=path)
+    db.save_result("omar", "riasec", _riasec(), db_path=path)
+
+    assert db.cohorts("school", db_path=path) == {"GHS": 2}
+    live = {r["school"]: r["n"] for r in db.cohort_means("riasec", "school", db_path=path)}
+    assert live == {"GHS": 2}
+
+
+def test_retake_counts_once_with_latest_scores(path):
+    db.save_profile("hina", school="GHS", db_path=path)
+    db.save_result("hina", "riasec", _riasec(R=1.0), db_path=path)
+    db.save_result("hina", "riasec", _riasec(R=5.0), db_path=path)
+    summary = db.cohort_summary("school", "GHS", db_path=path)
+    assert summary["means"]["riasec"]["R"] == (1, 5.0, 0.0)
+    assert summary["histograms"]["riasec"]["R"] == [(5.0, 1)]
+    assert sum(n for _, n in summary["top3"]) == 1
+    assert db.cohorts("school", db_path=path) == {"GHS": 1}
+
+
+def test_changing_school_moves_the_student(path):
+    db.save_profile("ali", school="GHS", education="9", db_path=path)
+    db.save_test_results("ali", _riasec(), {t: 1 for t in TCI}, db_path=path)
+    db.save_profile("ali", school="City College", education="11", db_path=path)
+    assert db.cohorts("school", db_path=path) == {"City College": 1}
+    assert db.cohorts("education", db_path=path) == {"11": 1}
+    assert db.cohort_summary("school", "GHS", db_path=path)["means"] == {}
+
+
+def test_top3_code():
+    assert db.top3_code({"R": 1, "I": 5, "A": 4, "S": 4, "E": 2, "C": 3}) == "IAS"
+    assert db.top3_code({c: 3 for c in "RIASEC"}) == "RIA"  # ties keep RIASEC order
+    assert db.top3_code({"R": 1}) is None
+
+
+def test_incremental_aggregates_match_a_rebuild(path):
+    rng = random.Random(7)
+    users = [f"u{i}" for i in range(30)]
+    for _ in range(300):
+        user = rng.choice(users)
+        if rng.random() < 0.2:
+            db.save_profile(user, school=rng.choice(["GHS", "City", None]),
+                            education=rng.choice(["9", "10"]), db_path=path)
+        elif rng.random() < 0.5:
+            db.save_result(user, "riasec", {c: rng.choice([1, 2.5, 3.5, 5]) for c in "RIASEC"}, db_path=path)
+        else:
+            db.save_result(user, "tci", {t: rng.randint(0, 10) for t in TCI}, db_path=path)
+
+    incremental = _aggregates(path)
+    rebuilt = _rebuilt(path)
+    assert incremental.keys() == rebuilt.keys()
+    for table in db.AGGREGATE_TABLES:
+        assert len(incremental[table]) == len(rebuilt[table]), table
+        for a, b in zip(incremental[table], rebuilt[table]):
+            assert a == pytest.approx(b), table
+
+
+def test_cohort_summary_rejects_unknown_scope(path):
+    with pytest.raises(ValueError):
+        db.cohort_summary("gender", "F", db_path=path)
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import jobs
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+def test_enqueue_spools_the_upload(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # spool/ is relative to the working directory
+    job_id = jobs.enqueue_marksheet("u1", "../../evil/sheet.jpg", b"jpeg", {"riasec": None}, db_path=db)
+    job = jobs.get_job(job_id, db)
+    assert job["status"] == "queued"
+    assert job["payload"] == {"riasec": None, "filename": "sheet.jpg"}
+    assert os.path.basename(job["file_path"]).endswith("_sheet.jpg")
+    assert os.path.dirname(job["file_path"]) == jobs.SPOOL_DIR
+    with open(job["file_path"], "rb") as f:
+        assert f.read() == b"jpeg"
+
+
+def test_claim_complete(db):
+    first = jobs.enqueue("u1", "a.jpg", db_path=db)
+    second = jobs.enqueue("u2", "b.jpg", db_path=db)
+    conn = jobs.connect(db)
+    job = jobs.claim_next(conn)
+    assert (job["id"], job["status"], job["attempts"]) == (first, "running", 1)
+    assert jobs.claim_next(conn)["id"] == second
+    assert jobs.claim_next(conn) is None
+
+    jobs.complete(conn, first, {"best_field": "Medical"})
+    conn.close()
+    assert jobs.get_job(first, db)["result"] == {"best_field": "Medical"}
+
+
+def test_failed_job_is_retried_then_given_up(db):
+    job_id = jobs.enqueue("u1", "a.jpg", db_path=db)
+    conn = jobs.connect(db)
+    for attempt in range(1, jobs.MAX_ATTEMPTS + 1):
+        job = jobs.claim_next(conn)
+        status = jobs.fail(conn, job["id"], "boom", job["attempts"])
+        assert status == ("failed" if attempt == jobs.MAX_ATTEMPTS else "queued")
+        conn.execute("UPDATE marksheet_jobs SET not_before = NULL")  # backoff elapsed
+    conn.close()
+    job = jobs.get_job(job_id, db)
+    assert (job["status"], job["error"], job["attempts"]) == ("failed", "boom", jobs.MAX_ATTEMPTS)
+
+
+def test_retry_waits_for_backoff(db):
+    job_id = jobs.enqueue("u1", "a.jpg", db_path=db)
+    conn = jobs.connect(db)
+    jobs.fail(conn, jobs.claim_next(conn)["id"], "boom", 1)
+    assert jobs.claim_next(conn) is None                    # still backing off
+    delay = conn.execute(
+        "SELECT CAST(strftime('%s', not_before) - strftime('%s', 'now') AS INTEGER) FROM marksheet_jobs"
+    ).fetchone()[0]
+    assert jobs.RETRY_DELAY - 5 <= delay <= jobs.RETRY_DELAY
+    conn.execute("UPDATE marksheet_jobs SET not_before = datetime('now', '-1 second')")
+    assert jobs.claim_next(conn)["id"] == job_id
+    conn.close()
+
+
+def test_remove_spool(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    job = jobs.get_job(jobs.enqueue_marksheet("u1", "sheet.jpg", b"jpeg", db_path=db), db)
+    jobs.remove_spool(job)
+    assert not os.path.exists(job["file_path"])
+    jobs.remove_spool(job)  # already gone is fine
+
+
+def test_requeue_stale(db):
+    job_id = jobs.enqueue("u1", "a.jpg", db_path=db)
+    conn = jobs.connect(db)
+    jobs.claim_next(conn)
+    jobs.requeue_stale(conn, older_than_seconds=600)
+    assert jobs.get_job(job_id, db)["status"] == "running"   # still fresh
+    conn.execute("UPDATE marksheet_jobs SET updated_at = datetime('now', '-1 hour')")
+    jobs.requeue_stale(conn, older_than_seconds=600)
+    conn.close()
+    assert jobs.get_job(job_id, db)["status"] == "queued"
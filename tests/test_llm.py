@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import LLM
+
+MARKS = [
+    (1, "MATHEMATICS", 150, 140), (1, "PHYSICS", 150, 120), (1, "ENGLISH", 150, 100),
+    (1, "URDU", 150, 90), (1, "TOTAL", 1100, 450), (1, "BIOLOGY", 150, 60),
+    (2, "GENERAL MATHEMATICS", 150, 80), (2, "MATHEMATICS", 150, 70), (2, "COMPUTER SCIENCE", 150, 145),
+    (2, "ENGLISH", 150, 130), (2, "CHEMISTRY", 150, 110),
+]
+PERSONALITY = {
+    "1": {"riasec_I": 4.0, "riasec_A": 2.0, "riasec_C": 3.5, "riasec_E": 1.5,
+          "tci_NoveltySeeking": 3, "tci_RewardDependence": 2},
+    "2": {"riasec_I": 2.5, "riasec_A": 4.5, "riasec_C": 1.0, "riasec_E": 4.0,
+          "tci_NoveltySeeking": 5, "tci_RewardDependence": 1},
+}
+
+
+def _marks(student):
+    return pd.DataFrame([(s, m, o) for sid, s, m, o in MARKS if sid == student],
+                        columns=["Subject", "Maximum", "Obtained"])
+
+
+def test_match_subject_prefers_the_best_keyword():
+    assert "MATHEMATICS" in LLM._SUBJECT_INDEX
+    scores = LLM.extract_subject_scores(LLM.prepare_marksheet(_marks(2)))
+    assert scores["computer"] == 145
+    assert scores["chemistry"] == 110
+    assert scores["physics"] == 0  # no such subject
+
+
+def test_calculate_best_fit_sums_to_one():
+    marks = LLM.extract_subject_scores(LLM.prepare_marksheet(_marks(1)))
+    probs = LLM.calculate_best_fit(marks, PERSONALITY["1"])
+    assert list(probs) == sorted(probs, key=probs.get, reverse=True)
+    assert sum(probs.values()) == pytest.approx(1, abs=0.01)
+
+
+def test_calculate_best_fit_matches_hand_computed_scores():
+    marks = {"math": 150, "physics": 75, "chemistry": 0, "biology": 0,
+             "computer": 150, "english": 75, "urdu": 0}
+    personality = {"riasec_I": 5, "riasec_C": 5, "tci_NoveltySeeking": 5}
+    # Old scalar formula: sum(marks / 150 * weight) + (trait_a + trait_b) / 10 * 0.3
+    raw = {
+        "Medical":          0.10 + 0.5 * 0.10 + 0.5 * 0.05 + (5 + 0) / 10 * 0.3,   # 0.325
+        "Engineering":      0.35 + 0.5 * 0.35 + 0.5 * 0.05 + (5 + 5) / 10 * 0.3,   # 0.85
+        "Computer Science": 0.30 + 0.5 * 0.20 + 0.25 + 0.5 * 0.10 + (5 + 5) / 10 * 0.3,  # 1.0
+        "Arts":             0.10 + 0.5 * 0.10 + 0.5 * 0.40 + 0,                     # 0.35
+        "Business":         0.20 + 0.5 * 0.20 + 0.5 * 0.30 + 0,                     # 0.45
+        "Commerce":         0.30 + 0.5 * 0.15 + 0.5 * 0.25 + (0 + 5) / 10 * 0.3,   # 0.65
+    }
+    assert sum(raw.values()) == pytest.approx(3.625)
+    expected = {"Computer Science": 0.276, "Engineering": 0.234, "Commerce": 0.179,
+                "Business": 0.124, "Arts": 0.097, "Medical": 0.09}
+    assert {f: round(v / 3.625, 3) for f, v in raw.items()} == expected
+
+    probs = LLM.calculate_best_fit(marks, personality)
+    assert probs == expected
+    assert list(probs) == list(expected)
+
+
+def test_cohort_matches_per_student(tmp_path):
+    marks_csv = tmp_path / "marks.csv"
+    pd.DataFrame(MARKS, columns=["id", "Subject", "Maximum", "Obtained"]).to_csv(marks_csv, index=False)
+    personality_csv = tmp_path / "response.csv"
+    pd.DataFrame([{"user_id": sid, **p} for sid, p in PERSONALITY.items()]).to_csv(personality_csv, index=False)
+
+    cohort = LLM.recommend_cohort(personality_csv, marks_csv).set_index("student_id")
+    for student in (1, 2):
+        best, _, scores = LLM.recommend(_marks(student), PERSONALITY[str(student)])
+        row = cohort.loc[str(student)]
+        assert row["best_field"] == best
+        assert row[LLM.FIELDS].to_dict() == pytest.approx(scores, abs=1e-3)
+
+
+def test_score_cohort_rows_are_probabilities():
+    rng = np.random.default_rng(0)
+    probs = LLM.score_cohort(rng.uniform(0, 150, (5, len(LLM.MARK_SUBJECTS))),
+                             rng.uniform(0, 5, (5, len(LLM.PERSONALITY_TRAITS))))
+    assert probs.shape == (5, len(LLM.FIELDS))
+    np.testing.assert_allclose(probs.sum(axis=1), 1)
+
+
+def test_personality_from_scores():
+    assert LLM.personality_from_scores({"I": 4.0}, {"Novelty Seeking": 2, "Self-Directedness": 1}) == {
+        "riasec_I": 4.0, "tci_NoveltySeeking": 2, "tci_SelfDirectedness": 1}
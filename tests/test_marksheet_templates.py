@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("cv2")
+import OCR  # noqa: E402
+import marksheet_templates  # noqa: E402
+
+BISE_SSC = [
+    "BOARD OF INTERMEDIATE AND SECONDARY EDUCATION", "SUBJECT - WISE STATEMENT OF MARKS",
+    "SR.NO", "SUBJECTS", "MAXIMUM", "OBTAINED",
+    "1", "URDU", "75", "60",
+    "2", "ENGLISH", "75", "55",
+    "3", "ISLAMIYAT", "50", "40",
+    "4", "TARJUMA-TUL-QURAN", "50", "45",
+    "5", "PAKISTAN STUDIES", "50", "38",
+    "6", "MATHEMATICS", "75", "70",
+    "7", "PHYSICS", "65", "50",
+    "TOTAL", "850", "426",
+]
+
+
+def _rows(df):
+    return [tuple(r) for r in df.itertuples(index=False)]
+
+
+def test_classifies_bise_ssc():
+    assert marksheet_templates.classify(BISE_SSC)["name"] == "bise_ssc"
+    assert marksheet_templates.classify(["RESULT CARD", "URDU", "75"]) is None
+
+
+def test_parses_every_row_including_subjects_outside_the_vocabulary():
+    rows = _rows(marksheet_templates.parse(BISE_SSC))
+    assert ("TARJUMA-TUL-QURAN", 50, 45) in rows
+    assert rows[0] == ("URDU", 75, 60)
+    assert rows[-1] == ("TOTAL", 850, 426)
+    assert len(rows) == 8
+    # same table as the generic heuristic on this layout
+    assert rows == _rows(OCR.parse_marks(BISE_SSC))
+
+
+def test_vocabulary_matches_whole_words_only():
+    subject_re = marksheet_templates.TEMPLATES["bise_ssc"]["subject_re"]
+    assert subject_re.search("EDUCATION")
+    assert subject_re.search("PHYSICAL EDUCATION")
+    assert not subject_re.search("EDUCATIONAL")
+    assert not subject_re.search("URDUX")
+
+
+def test_row_with_missing_mark_does_not_steal_the_next_row():
+    dump = BISE_SSC[:6] + ["URDU", "75", "ENGLISH", "75", "55", "PHYSICS", "65", "50"]
+    assert _rows(marksheet_templates.parse(dump))[:1] == [("ENGLISH", 75, 55)]
+
+
+def test_serial_numbers_are_skipped():
+    dump = BISE_SSC[:6] + ["URDU", "75", "2", "60", "ENGLISH", "75", "55", "PHYSICS", "65", "50"]
+    assert _rows(marksheet_templates.parse(dump))[0] == ("URDU", 75, 60)
+
+
+def test_unknown_layout_falls_back_to_parse_marks():
+    dump = ["RESULT CARD", "ART", "100", "80"]
+    assert _rows(marksheet_templates.parse(dump)) == _rows(OCR.parse_marks(dump))
+
+
+def test_register_template():
+    marksheet_templates.register_template("test_board", {
+        "header_anchor": "DETAILED MARKS", "columns": ["obtained", "maximum"],
+        "subjects": ["ALGEBRA", "GEOMETRY", "CALCULUS"], "min_subjects": 2,
+    })
+    try:
+        dump = ["DETAILED MARKS", "ALGEBRA", "88", "100", "GEOMETRY", "70", "100"]
+        assert marksheet_templates.classify(dump)["name"] == "test_board"
+        assert _rows(marksheet_templates.parse(dump)) == [("ALGEBRA", 100, 88), ("GEOMETRY", 100, 70)]
+    finally:
+        del marksheet_templates.TEMPLATES["test_board"]
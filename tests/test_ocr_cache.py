@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+
+import ocr_cache
+
+
+def _disk_size(cache):
+    return sum(size for _, _, size in cache._entries())
+
+
+def test_layers_round_trip(tmp_path):
+    cache = ocr_cache.OCRCache(str(tmp_path))
+    key = ocr_cache.image_digest(b"image bytes")
+    assert cache.get_raw(key) is None and cache.get_parsed(key, "1") is None
+
+    cache.put_raw(key, ["URDU", "75", "60", "اردو"])
+    df = pd.DataFrame({"Subject": ["URDU"], "Maximum": [75], "Obtained": [60]})
+    cache.put_parsed(key, "1", df)
+
+    assert cache.get_raw(key) == ["URDU", "75", "60", "اردو"]
+    pd.testing.assert_frame_equal(cache.get_parsed(key, "1"), df)
+    assert cache.get_parsed(key, "2") is None  # a new parser version misses
+
+
+def test_overwrite_does_not_inflate_size(tmp_path):
+    cache = ocr_cache.OCRCache(str(tmp_path))
+    for _ in range(10):
+        cache.put_raw("k", ["x" * 100])
+    assert cache._size == _disk_size(cache)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ocr_cache.OCRCache(str(tmp_path), max_bytes=1000)
+    for i in range(4):
+        cache.put_raw(f"k{i}", ["x" * 200])
+        os.utime(cache._raw_path(f"k{i}"), (i, i))
+    cache.get_raw("k0")                     # refreshes k0
+    cache.put_raw("k4", ["x" * 200])        # pushes the cache past max_bytes
+
+    assert cache.get_raw("k0") is not None
+    assert cache.get_raw("k1") is None
+    assert cache._size == _disk_size(cache) <= 900
+
+
+def test_size_is_recovered_on_open(tmp_path):
+    ocr_cache.OCRCache(str(tmp_path)).put_raw("k", ["abc"])
+    cache = ocr_cache.OCRCache(str(tmp_path))
+    assert cache._size == _disk_size(cache) > 0
+    cache.clear()
+    assert cache._size == 0 and cache.get_raw("k") is None
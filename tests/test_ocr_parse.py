@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("cv2")
+import OCR  # noqa: E402
+
+# rec_texts as PaddleOCR returns them for real uploads: board preamble,
+# Urdu captions, stray single letters and the serial-number column.
+SSC_SCAN = [
+    "BOARD OF INTERMEDIATE AND SECONDARY EDUCATION", "LAHORE", "Roll No.", "412345",
+    "SUBJECT - WISE STATEMENT OF MARKS",
+    "SR.NO.", "SUBJECTS", "MAXIMUM", "OBTAINED",
+    "1", "URDU", "اردو", "75", "60",
+    "2", "ENGLISH", "75", "55",
+    "3", "ISLAMIYAT", "L", "50", "40",
+    "4", "PAKISTAN STUDIES", "50", "38",
+    "5", "MATHEMATICS", "75", "70",
+    "TOTAL", "49", "850", "426",
+    "FIRST", "ANNUAL",
+]
+
+SERIAL_BETWEEN_MARKS = [
+    "SUBJECT - WISE STATEMENT OF MARKS",
+    "PHYSICS", "65", "7", "50",
+    "CHEMISTRY", "65", "52",
+]
+
+NO_ANCHOR = [
+    "SUBJECTS", "MAXIMUM", "OBTAINED",
+    "BIOLOGY", "65", "61",
+    "COMPUTER SCIENCE", "65", "58.5",
+]
+
+GOLDEN = [
+    (SSC_SCAN, [
+        ("URDU", 75, 60),
+        ("ENGLISH", 75, 55),
+        ("ISLAMIYAT", 50, 40),
+        ("PAKISTAN STUDIES", 50, 38),
+        ("MATHEMATICS", 75, 70),
+        ("TOTAL", 850, 426),
+    ]),
+    (SERIAL_BETWEEN_MARKS, [("PHYSICS", 65, 50), ("CHEMISTRY", 65, 52)]),
+    (NO_ANCHOR, [("BIOLOGY", 65, 61), ("COMPUTER SCIENCE", 65, 58)]),
+]
+
+
+@pytest.mark.parametrize("text_list, rows", GOLDEN)
+def test_parse_marks_golden(text_list, rows):
+    expected = pd.DataFrame(rows, columns=["Subject", "Maximum", "Obtained"])
+    pd.testing.assert_frame_equal(OCR.parse_marks(text_list), expected)
+
+
+def test_tokenize_marks_golden():
+    texts, kinds, nums, next_num, start = OCR.tokenize_marks(SERIAL_BETWEEN_MARKS)
+    assert start == 1
+    assert texts == SERIAL_BETWEEN_MARKS
+    assert list(kinds) == [
+        OCR.TOKEN_HEADER,
+        OCR.TOKEN_SUBJECT, OCR.TOKEN_OTHER, OCR.TOKEN_NOISE, OCR.TOKEN_OTHER,
+        OCR.TOKEN_SUBJECT, OCR.TOKEN_OTHER, OCR.TOKEN_OTHER,
+    ]
+    assert nums == [None, None, 65, 7, 50, None, 65, 52]
+    assert next_num == [2, 2, 2, 3, 4, 6, 6, 7, 8]
@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("cv2")
+import ocr_worker  # noqa: E402
+import storage  # noqa: E402
+
+
+def test_retry_does_not_duplicate_local_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # storage roots are relative to the working directory
+    marks = pd.DataFrame({"Subject": ["URDU"], "Maximum": [75], "Obtained": [60]})
+    personality = {c: 1.0 for c in storage.RIASEC_COLUMNS + storage.TCI_COLUMNS}
+    job = {"id": 7, "user_id": "u1", "attempts": 1, "payload": {"riasec": {"R": 1}, "tci": {"P": 1}}}
+
+    ocr_worker.save_local(job, marks, personality)
+    ocr_worker.save_local(dict(job, attempts=2), marks, personality)
+
+    assert storage.read_results(columns=["id"])["id"].tolist() == ["job-7"]
+    assert storage.read_marks_merged()[["subject", "max", "obtained"]].values.tolist() == [["URDU", 75, 60]]
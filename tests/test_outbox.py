@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+import outbox
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "outbox.db")
+
+
+def _rows(db):
+    conn = outbox.connect(db)
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM supabase_outbox ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_flush_sends_one_request_per_run(db):
+    for i in range(3):
+        outbox.insert("test_results", {"user_id": i}, db_path=db)
+    outbox.upsert("profiles", {"user_id": 1}, db_path=db)
+    client = outbox.FakeClient()
+
+    assert outbox.flush_all(client, db) == 4
+    assert client.calls == [("test_results", "insert", 3), ("profiles", "upsert", 1)]
+    assert outbox.pending_count(db) == 0
+
+
+def test_outage_backs_off_whole_run_after_one_probe(db):
+    for i in range(5):
+        outbox.insert("test_results", {"user_id": i}, db_path=db)
+    client = outbox.FakeClient(fail_next=10)
+
+    conn = outbox.connect(db)
+    assert outbox.flush(client, conn) == 0
+    conn.close()
+    # the batch request and one single-row probe, not one request per row
+    assert len(client.calls) == 2
+    rows = _rows(db)
+    assert {r["status"] for r in rows} == {"pending"}
+    assert all(r["attempts"] == 1 and r["next_attempt_at"] > 0 for r in rows)
+
+
+def test_bad_row_is_isolated(db):
+    for i in range(3):
+        outbox.insert("test_results", {"user_id": i}, db_path=db)
+
+    class OneBadRow(outbox.FakeClient):
+        def table(self, name):
+            table = super().table(name)
+            insert = table.insert
+
+            def checked(rows):
+                if any(r["user_id"] == 1 for r in rows):
+                    raise ValueError("bad row")
+                return insert(rows)
+            table.insert = checked
+            return table
+
+    client = OneBadRow()
+    conn = outbox.connect(db)
+    assert outbox.flush(client, conn) == 2
+    conn.close()
+    assert [r["user_id"] for r in client.tables["test_results"]] == [0, 2]
+    (left,) = _rows(db)
+    assert json.loads(left["row"]) == {"user_id": 1} and left["attempts"] == 1
+
+
+def test_row_goes_dead_after_max_attempts(db):
+    outbox.insert("test_results", {"user_id": 1}, db_path=db)
+    conn = outbox.connect(db)
+    row = dict(conn.execute("SELECT * FROM supabase_outbox").fetchone())
+    row["attempts"] = outbox.MAX_ATTEMPTS - 1
+    outbox._failed(conn, row, ConnectionError("down"), now=0)
+    conn.close()
+    assert _rows(db)[0]["status"] == "dead"
+    assert outbox.pending_count(db) == 0
+
+
+def test_newer_upsert_replaces_unsent_one(db):
+    outbox.upsert("profiles", {"user_id": "u1", "age": 15}, db_path=db, key="u1")
+    outbox.upsert("profiles", {"user_id": "u2", "age": 20}, db_path=db, key="u2")
+    outbox.upsert("profiles", {"user_id": "u1", "age": 16}, db_path=db, key="u1")
+
+    client = outbox.FakeClient()
+    outbox.flush_all(client, db)
+    assert client.tables["profiles"] == [{"user_id": "u2", "age": 20}, {"user_id": "u1", "age": 16}]
+
+
+def test_keyed_row_waits_for_older_row_in_flight(db):
+    outbox.upsert("profiles", {"user_id": "u1", "age": 15}, db_path=db, key="u1")
+    conn = outbox.connect(db)
+    (first,) = outbox.claim_batch(conn)        # now 'sending'
+
+    outbox.upsert("profiles", {"user_id": "u1", "age": 16}, db_path=db, key="u1")
+    outbox.insert("test_results", {"user_id": "u1"}, db_path=db)  # other table, not blocked
+    assert [r["table_name"] for r in outbox.claim_batch(conn)] == ["test_results"]
+
+    # the older upsert fails and backs off: the newer one still may not overtake it
+    outbox._failed(conn, first, ConnectionError("down"), now=0)
+    assert outbox.claim_batch(conn, now=0) == []
+    assert [json.loads(r["row"])["age"] for r in outbox.claim_batch(conn, now=10**10)] == [15]
+    conn.close()
+
+
+def test_requeue_stale(db):
+    outbox.insert("test_results", {"user_id": 1}, db_path=db)
+    conn = outbox.connect(db)
+    outbox.claim_batch(conn, now=0)
+    outbox.requeue_stale(conn, older_than_seconds=60)
+    conn.close()
+    assert _rows(db)[0]["status"] == "pending"
+
+
+def test_unknown_op(db):
+    with pytest.raises(ValueError):
+        outbox.enqueue("profiles", {}, op="delete", db_path=db)
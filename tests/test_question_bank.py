@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+
+import question_bank
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_shipped_banks_parse():
+    bank = question_bank.parse_riasec(os.path.join(ROOT, question_bank.QUESTIONS_CSV))
+    assert tuple(bank.labels) == question_bank.RIASEC_CODES
+    assert len(bank) == bank.onehot.shape[0] and bank.counts.sum() == len(bank)
+    tci = question_bank.parse_tci(os.path.join(ROOT, question_bank.TCI_QUESTIONS_CSV))
+    assert tci.column == "trait" and len(tci) > 0
+    careers = question_bank.parse_careers(os.path.join(ROOT, question_bank.CAREERS_CSV))
+    assert set(careers) <= set(question_bank.RIASEC_CODES)
+
+
+def test_arrays_are_read_only(tmp_path):
+    path = tmp_path / "q.csv"
+    path.write_text("question,category\nBuild things,R\nStudy cells,I\nPaint,A\n")
+    bank = question_bank.parse_riasec(path)
+    with pytest.raises(ValueError):
+        bank.codes[0] = 1
+    np.testing.assert_array_equal(bank.counts, [1, 1, 1, 0, 0, 0])
+    frame = bank.to_frame()
+    frame.loc[0, "category"] = "C"  # a copy, the bank is untouched
+    assert bank.labels[bank.codes[0]] == "R"
+
+
+@pytest.mark.parametrize("text, error", [
+    ("question\nBuild things\n", "missing column"),
+    ("question,category\nBuild things,X\n", "unknown category"),
+    ("question,category\n  ,R\n", "empty question"),
+])
+def test_bad_banks_are_rejected(tmp_path, text, error):
+    path = tmp_path / "q.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=error):
+        question_bank.parse_riasec(path)
+
+
+def test_careers_keep_unquoted_lists(tmp_path):
+    path = tmp_path / "careers.csv"
+    path.write_text("code,careers\nR,Engineer, Electrician ,Pilot\nI,\n")
+    careers = question_bank.parse_careers(path)
+    assert careers["R"] == ("Engineer", "Electrician", "Pilot")
+    assert careers["I"] == ()
+    with pytest.raises(TypeError):
+        careers["A"] = ()
+
+
+def test_load_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "q.csv"
+    path.write_text("question,category\nBuild things,R\n")
+    first = question_bank.load_riasec(str(path))
+    assert question_bank.load_riasec(str(path)) is first
+
+    path.write_text("question,category\nBuild things,R\nStudy cells,I\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert len(question_bank.load_riasec(str(path))) == 2
+
+    path.write_text("question,category\nBuild things,Z\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2_000_000))
+    with pytest.raises(ValueError, match="q.csv"):
+        question_bank.load_riasec(str(path))
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import responses
+
+
+def _test(user, answer, n=3):
+    return pd.DataFrame({
+        "id": range(1, n + 1),
+        "question": [f"q{i}" for i in range(1, n + 1)],
+        "category": ["R", "I", "A"][:n],
+        "answer": [answer] * n,
+        "username": user,
+        "email": f"{user}@example.com",
+    })
+
+
+def test_append_keeps_each_test_together(tmp_path):
+    db = str(tmp_path / "responses.db")
+    first = responses.append(_test("amna", "Like"), db)
+    second = responses.append(_test("bilal", "Dislike").drop(columns="email"), db)
+    assert first != second
+
+    stored = responses.load(db)
+    assert stored.columns.tolist() == responses.COLUMNS
+    assert stored["username"].tolist() == ["amna"] * 3 + ["bilal"] * 3
+    assert stored["email"].iloc[3:].isna().all()  # missing columns are stored as NULL
+    assert stored["id"].tolist() == [1, 2, 3, 1, 2, 3]
+
+
+def test_excel_round_trip(tmp_path):
+    pytest.importorskip("openpyxl")
+    db = str(tmp_path / "responses.db")
+    responses.append(_test("amna", "Like"), db)
+    responses.append(_test("bilal", "Dislike"), db)
+    path = responses.export_excel(str(tmp_path / "out" / "responses.xlsx"), db)
+
+    copy = str(tmp_path / "copy.db")
+    assert responses.import_excel(path, copy) == 6
+    pd.testing.assert_frame_equal(responses.load(copy).astype(str), responses.load(db).astype(str))
+    conn = responses.connect(copy)
+    assert conn.execute("SELECT COUNT(DISTINCT submission_id) FROM responses").fetchone()[0] == 2
+    conn.close()
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+from question_bank import QuestionBank
+
+
+@pytest.fixture
+def riasec_bank():
+    # Two questions per category, interleaved like questions.csv
+    codes = [0, 1, 2, 3, 4, 5] * 2
+    return QuestionBank([f"q{i}" for i in range(12)], list("RIASEC"), codes, "category")
+
+
+@pytest.fixture
+def tci_bank():
+    return QuestionBank([f"t{i}" for i in range(4)], ["Persistence", "Harm Avoidance"],
+                        [0, 0, 1, 1], "trait")
+
+
+def _groupby_mean(bank, values):
+    df = bank.to_frame().assign(value=values)
+    return df.groupby(bank.column)["value"].mean()
+
+
+def test_riasec_scores_match_groupby_mean(riasec_bank):
+    answers = ["Agree", "Disagree", "Neutral", "Strongly Agree", "Strongly Disagree", "Agree"] * 2
+    values = scoring.encode(answers, scoring.RIASEC_RATINGS)
+    pd.testing.assert_series_equal(scoring.riasec_scores(riasec_bank, answers),
+                                   _groupby_mean(riasec_bank, values), check_names=False)
+
+
+def test_partly_answered_sheet_skips_unanswered_per_category(riasec_bank):
+    packed = scoring.blank_answers(riasec_bank)
+    packed[0] = 4            # R: one of two answered
+    packed[6] = 2            # R: second answer
+    packed[1] = 5            # I: one of two answered, the other is unanswered
+    scores = scoring.riasec_scores(riasec_bank, packed)
+    assert scores["R"] == 3.0
+    assert scores["I"] == 5.0
+    assert scores[["A", "S", "E", "C"]].isna().all()  # nothing answered there
+
+
+def test_unknown_label_does_not_poison_other_categories(riasec_bank):
+    answers = ["Agree"] * 12
+    answers[3] = "No idea"   # encode() maps it to NaN
+    scores = scoring.riasec_scores(riasec_bank, answers)
+    assert not scores.isna().any()
+    assert (scores == 4.0).all()
+
+
+def test_tci_sum_counts_true_answers(tci_bank):
+    scores = scoring.tci_scores(tci_bank, ["T", "F", "T", "T"])
+    assert scores.to_dict() == {"Harm Avoidance": 2, "Persistence": 1}
+    assert scores.dtype == np.int64
+
+
+def test_score_many_matches_single_scores(riasec_bank):
+    rows = [["Agree"] * 12, ["Disagree", "Neutral"] * 6]
+    many = scoring.score_many(riasec_bank, rows, scoring.RIASEC_RATINGS)
+    for row, (_, got) in zip(rows, many.iterrows()):
+        single = scoring.riasec_scores(riasec_bank, row)
+        assert got[single.index].tolist() == single.tolist()
+
+
+def test_score_rejects_wrong_length(riasec_bank):
+    with pytest.raises(ValueError):
+        scoring.score(riasec_bank, np.ones(5))
+
+
+def test_pack_round_trip(riasec_bank):
+    answers = ["Agree", "Neutral", "Strongly Agree"]
+    packed = scoring.pack_answers(answers, scoring.RIASEC_RATINGS, n=len(riasec_bank))
+    assert packed.dtype == np.int8
+    assert scoring.answered(packed) == 3
+    assert scoring.unpack_answers(packed, scoring.RIASEC_RATINGS)[:4] == answers + [None]
+
+    scores = scoring.riasec_scores(riasec_bank, ["Agree"] * 12)
+    restored = scoring.unpack_riasec(riasec_bank, scoring.pack_scores(riasec_bank, scores))
+    assert restored.sort_index().tolist() == scores.sort_index().tolist()
+    assert scoring.unpack_riasec(riasec_bank, None) is None
+
+
+def test_unpacked_scores_equal_the_originals(riasec_bank, tci_bank):
+    riasec = pd.Series([3.4, 2.75, 4.1, 1.3, 0.2, 5.0], index=riasec_bank.labels)
+    packed = scoring.pack_scores(riasec_bank, riasec)
+    assert packed.dtype == np.float32 and float(packed[0]) != 3.4
+    restored = scoring.unpack_riasec(riasec_bank, packed)
+    assert restored.to_dict() == riasec.to_dict()
+    assert all(type(v) is float for v in restored.to_dict().values())
+
+    tci = pd.Series(np.arange(len(tci_bank.labels)) * 3 + 1, index=tci_bank.labels)
+    assert scoring.unpack_tci(tci_bank, scoring.pack_scores(tci_bank, tci)).to_dict() == tci.to_dict()
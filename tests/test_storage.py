@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import storage  # noqa: E402
+
+
+def _ocr(*rows):
+    return pd.DataFrame(rows, columns=["Subject", "Maximum", "Obtained"])
+
+
+def _merged(root):
+    return storage.read_marks_merged(root=root).sort_values(["student_id", "subject"]).reset_index(drop=True)
+
+
+def test_append_and_read_with_max_rule(tmp_path):
+    root = str(tmp_path / "marks")
+    storage.append_marks(_ocr(("urdu ", 75, 60), ("English", 75, 50)), student_id=1, root=root)
+    storage.append_marks(_ocr(("URDU", 75, 65), ("Physics", "65", "x")), student_id=1, root=root)
+
+    merged = _merged(root)
+    assert merged[["subject", "obtained"]].values.tolist() == [["ENGLISH", 50], ["URDU", 65]]
+    assert storage.read_marks(columns=["subject"], root=root).columns.tolist() == ["subject"]
+
+
+def test_out_of_range_marks_are_dropped_not_wrapped(tmp_path):
+    root = str(tmp_path / "marks")
+    storage.append_marks(_ocr(("URDU", 123456, 60), ("ENGLISH", 75, 40000), ("MATHS", 75, -1),
+                              ("TOTAL", 1100, 850)), student_id=1, root=root)
+    assert _merged(root)[["subject", "max", "obtained"]].values.tolist() == [["TOTAL", 1100, 850]]
+
+
+def test_since_prunes_older_partitions(tmp_path):
+    root = str(tmp_path / "marks")
+    storage.append_marks(_ocr(("URDU", 75, 60)), student_id=1, root=root, ingest_date="2025-01-01")
+    storage.append_marks(_ocr(("URDU", 75, 70)), student_id=2, root=root, ingest_date="2025-02-01")
+    assert storage.read_marks(since="2025-01-15", root=root)["student_id"].tolist() == ["2"]
+
+
+def test_missing_root_reads_empty(tmp_path):
+    df = storage.read_marks(columns=["student_id", "max"], root=str(tmp_path / "none"))
+    assert df.empty and df.columns.tolist() == ["student_id", "max"]
+
+
+def test_compaction_merges_segments_without_changing_reads(tmp_path):
+    root = str(tmp_path / "marks")
+    for i in range(6):
+        storage.append_marks(_ocr(("URDU", 75, 50 + i), (f"SUBJECT{i % 3}", 100, i)),
+                             student_id=i % 2, root=root, ingest_date="2025-03-01")
+    before = _merged(root)
+    part_dir = os.path.join(root, "ingest_date=2025-03-01")
+
+    assert storage.compact(root, min_segments=10) == 0  # below the threshold
+    assert storage.compact(root, min_segments=4) == 6
+    assert len(storage._segments(part_dir)) == 1
+    pd.testing.assert_frame_equal(_merged(root), before)
+
+    # appends after compaction still win through the max rule
+    storage.append_marks(_ocr(("URDU", 75, 74)), student_id=0, root=root, ingest_date="2025-03-01")
+    merged = _merged(root)
+    assert merged.query("student_id == '0' and subject == 'URDU'")["obtained"].item() == 74
+
+
+def test_results_round_trip(tmp_path):
+    root = str(tmp_path / "results")
+    storage.append_results(pd.DataFrame([{
+        "id": "a", "user_id": 7, "created_at": "2025-11-17 10:00:00.123456789",
+        "riasec_R": 3.5, "tci_Persistence": 4,
+    }]), root=root)
+    df = storage.read_results(root=root)
+    assert df.loc[0, "user_id"] == "7"
+    assert df.loc[0, "riasec_R"] == pytest.approx(3.5)
+    assert pd.isna(df.loc[0, "riasec_I"])
+    assert df.loc[0, "created_at"] == pd.Timestamp("2025-11-17 10:00:00.123456")